@@ -0,0 +1,81 @@
+"""Memory benchmark: dict vs Contact vs CompactContact vs ContactArray.
+
+Builds the same synthetic address book in each form and measures the
+memory it keeps with tracemalloc (strings included). Every row gets fresh
+strings, as when reading contacts from a file.
+
+Usage: python bench_contacts.py [n_contacts]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from compact_contact import CompactContact, ContactArray
+from contact import Contact
+
+DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "example.com", "company.hu",
+           "mail.de", "icloud.com", "proton.me"]
+COUNTRY_CODES = ["+36", "+1", "+44", "+49", "+33"]
+
+
+def rows(n):
+    rng = random.Random(42)
+    for i in range(n):
+        name = f"Person {i}"
+        email = f"person{i}@{rng.choice(DOMAINS)}"
+        phone = f"{rng.choice(COUNTRY_CODES)}-{rng.randint(10, 99)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+        yield name, email, phone
+
+
+def as_dicts(n):
+    return [{"name": name, "email": email, "phone": phone} for name, email, phone in rows(n)]
+
+
+def as_contacts(n):
+    return [Contact(name, email, phone) for name, email, phone in rows(n)]
+
+
+def as_compact_contacts(n):
+    return [CompactContact(name, email, phone) for name, email, phone in rows(n)]
+
+
+def as_contact_array(n):
+    contacts = ContactArray()
+    for name, email, phone in rows(n):
+        contacts.append(name, email, phone)
+    return contacts
+
+
+def measure(build, n):
+    tracemalloc.start()
+    start = time.perf_counter()
+    book = build(n)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return book, size, elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{n:,} contacts")
+    print(f"{'form':<16} {'MB':>8} {'bytes/contact':>14} {'vs dict':>8} {'build (s)':>10}")
+
+    baseline = None
+    for label, build in [("dict", as_dicts), ("Contact", as_contacts),
+                         ("CompactContact", as_compact_contacts),
+                         ("ContactArray", as_contact_array)]:
+        book, size, elapsed = measure(build, n)
+        baseline = baseline or size
+        print(f"{label:<16} {size / 1e6:>8.1f} {size / n:>14.1f} {size / baseline:>7.0%} {elapsed:>10.2f}")
+        # Same data in every form
+        first = book[0]
+        email = first["email"] if isinstance(first, dict) else first.email
+        assert email == next(rows(1))[1]
+        del book, first
+
+
+if __name__ == "__main__":
+    main()
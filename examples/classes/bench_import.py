@@ -0,0 +1,76 @@
+"""Benchmark contact import: one record at a time vs chunked validation.
+
+Writes a synthetic CSV (about 2% invalid rows) and imports it with
+  - a per-record loop: csv.DictReader, validate one row at a time,
+    ContactArray.append
+  - contact_import.import_contacts in chunks (validate_chunk, extend)
+and prints rows/sec for each. Both keep the contacts in a ContactArray.
+
+Usage: python bench_import.py [n_rows]
+"""
+
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+from compact_contact import ContactArray
+from contact_import import FIELDS, import_contacts
+from validation import is_valid_email, is_valid_phone
+
+DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "example.com", "company.hu"]
+BAD_EMAILS = ["no-at-sign.com", "two@@example.com", "user@localhost", "", "a b@example.com"]
+BAD_PHONES = ["12345", "phone", ""]
+
+
+def write_synthetic(path, n):
+    rng = random.Random(42)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        for i in range(n):
+            email = f"person{i}@{rng.choice(DOMAINS)}"
+            phone = f"+36-{rng.randint(10, 99)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+            if rng.random() < 0.01:
+                email = rng.choice(BAD_EMAILS)
+            if rng.random() < 0.01:
+                phone = rng.choice(BAD_PHONES)
+            writer.writerow((f"Person {i}", email, phone))
+
+
+def import_per_record(path):
+    contacts = ContactArray()
+    rejected = 0
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            name, email, phone = row["name"].strip(), row["email"].strip(), row["phone"].strip()
+            if name and is_valid_email(email) and is_valid_phone(phone):
+                contacts.append(name, email, phone)
+            else:
+                rejected += 1
+    return contacts, rejected
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "contacts.csv")
+        write_synthetic(path, n)
+        print(f"{n:,} rows, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        contacts, rejected = import_per_record(path)
+        elapsed = time.perf_counter() - start
+        print(f"{'per record':<12} {elapsed:>6.2f} s {n / elapsed:>12,.0f} rows/sec  ({rejected:,} rejected)")
+        del contacts
+
+        _, result = import_contacts(path, os.path.join(tmp, "rejects.csv"))
+        print(f"{'chunked':<12} {result.seconds:>6.2f} s {result.rows_per_sec:>12,.0f} rows/sec  "
+              f"({result.rejected:,} rejected)")
+        assert result.rejected == rejected
+
+
+if __name__ == "__main__":
+    main()
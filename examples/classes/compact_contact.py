@@ -0,0 +1,194 @@
+# compact_contact.py - Memory-efficient contacts for very large address books
+#
+# A normal Contact object carries its own __dict__ (about 100+ bytes) and
+# every email and phone number is a separate string, although most contacts
+# share a handful of email domains ("gmail.com") and country codes ("+36").
+#
+# CompactContact:
+#   - __slots__ instead of __dict__
+#   - the email is stored as local part + domain, the phone as country code
+#     + rest; domain and country code are interned (sys.intern), so all
+#     contacts with the same domain point to one string object
+#   - email and phone are properties, so the Contact API stays the same
+#
+# ContactArray ("struct of arrays"): one list / array per field instead of
+# one object per contact. Domains (with their "@") and country codes are
+# stored once in a table and every row keeps only a small integer id
+# (array("I")).
+#
+# Run bench_contacts.py to compare the memory use with Contact and dict.
+
+import re
+import sys
+from array import array
+from itertools import repeat
+from operator import add, itemgetter, methodcaller
+
+from validation import is_valid_email
+
+COUNTRY_CODE_PATTERN = re.compile(r"\+[0-9]*")
+# (country code, rest) of any string; the country code group may not match
+PHONE_PARTS_PATTERN = re.compile(r"(\+[0-9]*)?(.*)", re.DOTALL)
+
+
+def split_email(email):
+    """("alice", "example.com") for "alice@example.com"; the domain is interned.
+
+    An email without "@" is kept whole: (email, None).
+    """
+    local, at, domain = email.rpartition("@")
+    if not at:
+        return email, None
+    return local, sys.intern(domain)
+
+
+def split_phone(phone):
+    """("+36", "-20-111-2222") for "+36-20-111-2222"; the country code is interned.
+
+    Numbers without a leading "+" have no country code: ("", phone).
+    """
+    match = COUNTRY_CODE_PATTERN.match(phone)
+    if match is None:
+        return "", phone
+    return sys.intern(match.group()), phone[match.end():]
+
+
+class CompactContact:
+    __slots__ = ("name", "_local", "_domain", "_country_code", "_number")
+
+    def __init__(self, name, email, phone):
+        self.name = name
+        self.email = email
+        self.phone = phone
+
+    @property
+    def email(self):
+        if self._domain is None:
+            return self._local
+        return f"{self._local}@{self._domain}"
+
+    @email.setter
+    def email(self, email):
+        self._local, self._domain = split_email(email)
+
+    @property
+    def phone(self):
+        return self._country_code + self._number
+
+    @phone.setter
+    def phone(self, phone):
+        self._country_code, self._number = split_phone(phone)
+
+    def validate_email(self):
+        # Same rule as Contact (see validation.py)
+        return is_valid_email(self.email)
+
+    def __str__(self):
+        return f"Contact(name={self.name}, email={self.email}, phone={self.phone})"
+
+
+class ContactArray:
+    """Contacts stored column by column; rows are returned as CompactContact."""
+
+    def __init__(self, contacts=()):
+        self._names = []
+        self._locals = []
+        self._domain_ids = array("I")
+        self._country_code_ids = array("I")
+        self._numbers = []
+        # Every distinct "@domain" / country code is stored once
+        self._domains, self._domain_index = [], {}
+        self._country_codes, self._country_code_index = [], {}
+        for contact in contacts:
+            self.append(contact.name, contact.email, contact.phone)
+
+    @staticmethod
+    def _id(value, values, index):
+        value_id = index.get(value)
+        if value_id is None:
+            value_id = index[value] = len(values)
+            values.append(value)
+        return value_id
+
+    @staticmethod
+    def _ids(values, table, index):
+        """_id for a whole column; new values get ids in order of appearance."""
+        ids = list(map(index.get, values))
+        if None in ids:
+            for value in dict.fromkeys(values):
+                if value not in index:
+                    index[value] = len(table)
+                    table.append(value)
+            ids = list(map(index.get, values))
+        return ids
+
+    def append(self, name, email, phone):
+        local, at, domain = email.partition("@")
+        country_code, number = PHONE_PARTS_PATTERN.fullmatch(phone).groups("")
+        self._names.append(name)
+        self._locals.append(local)
+        self._domain_ids.append(self._id(at + domain, self._domains, self._domain_index))
+        self._country_code_ids.append(
+            self._id(country_code, self._country_codes, self._country_code_index))
+        self._numbers.append(number)
+
+    def extend(self, names, emails, phones):
+        """Append whole columns at once (lists of equal length).
+
+        The columns are split with map() and C-level helpers, so no Python
+        code runs per row.
+        """
+        email_parts = list(map(str.partition, emails, repeat("@")))
+        domains = list(map(add, map(itemgetter(1), email_parts), map(itemgetter(2), email_parts)))
+        phone_parts = list(map(methodcaller("groups", ""), map(PHONE_PARTS_PATTERN.fullmatch, phones)))
+        self._names.extend(names)
+        self._locals.extend(map(itemgetter(0), email_parts))
+        self._domain_ids.extend(self._ids(domains, self._domains, self._domain_index))
+        self._country_code_ids.extend(self._ids(
+            list(map(itemgetter(0), phone_parts)), self._country_codes, self._country_code_index))
+        self._numbers.extend(map(itemgetter(1), phone_parts))
+
+    def rows(self):
+        """(name, email, phone) tuples, without creating contact objects."""
+        for i in range(len(self)):
+            yield self._names[i], self.email(i), self.phone(i)
+
+    def name(self, i):
+        return self._names[i]
+
+    def email(self, i):
+        return self._locals[i] + self._domains[self._domain_ids[i]]
+
+    def phone(self, i):
+        return self._country_codes[self._country_code_ids[i]] + self._numbers[i]
+
+    def with_domain(self, domain):
+        """Row numbers of the contacts with this email domain (compares ids only)."""
+        domain_id = self._domain_index.get("@" + domain)
+        if domain_id is None:
+            return []
+        return [i for i, d in enumerate(self._domain_ids) if d == domain_id]
+
+    def __getitem__(self, i):
+        return CompactContact(self.name(i), self.email(i), self.phone(i))
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+if __name__ == "__main__":
+    contact = CompactContact("Alice", "alice@example.com", "+36-20-111-2222")
+    print(contact, contact.validate_email())
+
+    contacts = ContactArray([
+        contact,
+        CompactContact("Bob", "bob@example.com", "+36-30-333-4444"),
+        CompactContact("Charlie", "charlie@mail.com", "987-654-3210"),
+    ])
+    for row in contacts:
+        print(row)
+    print([contacts.name(i) for i in contacts.with_domain("example.com")])
@@ -0,0 +1,17 @@
+from validation import is_valid_email
+
+
+class Contact:
+    # Initialize the Contact class with name, email, and phone attributes
+    # constructor method to set the attributes when a new Contact object is created
+    def __init__(self, name, email, phone):
+        self.name = name
+        self.email = email
+        self.phone = phone
+
+    def validate_email(self):
+        # Email validation: one "@" and a domain with a "." (see validation.py)
+        return is_valid_email(self.email)
+
+    def __str__(self):
+        return f"Contact(name={self.name}, email={self.email}, phone={self.phone})"
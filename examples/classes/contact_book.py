@@ -0,0 +1,155 @@
+# contact_book.py - Contact book with indexes for fast lookups
+#
+# Besides the main dictionary (name -> Contact) the book keeps:
+#   - a hash index on the normalized email  -> O(1) find_by_email
+#   - a hash index on the normalized phone  -> O(1) find_by_phone
+#   - a sorted list of names                -> prefix search with bisect,
+#                                              sorted iteration without sorting
+# Every index is updated on add / update / remove, so nothing is rebuilt.
+# An email or phone number can belong to one contact only, since the
+# indexes map it to a single name; an empty one is not indexed at all, so
+# any number of contacts may leave it blank (find_by_* never finds them).
+# Change contacts through the book (update), not by setting attributes on
+# the Contact directly, otherwise the indexes go out of date.
+
+from bisect import bisect_left, insort
+
+from contact import Contact
+
+
+def normalize_email(email):
+    """Emails are compared case-insensitively and without surrounding spaces."""
+    return email.strip().casefold()
+
+
+def normalize_phone(phone):
+    """Keep only the digits, so "+36-20-111-2222" and "36 20 1112222" match."""
+    return "".join(c for c in phone if c.isdigit())
+
+
+def _sort_key(name):
+    # Case-insensitive order; the name itself breaks ties
+    return (name.casefold(), name)
+
+
+class ContactBook:
+    def __init__(self, contacts=()):
+        self._by_name = {}
+        self._by_email = {}
+        self._by_phone = {}
+        self._sorted = []  # _sort_key(name) of every contact, kept sorted
+        for contact in contacts:
+            self.add(contact)
+
+    def add(self, contact):
+        """Add a contact; names and non-empty emails and phone numbers must be unique."""
+        if contact.name in self._by_name:
+            raise ValueError(f"Contact '{contact.name}' already exists")
+        self._check_unique(contact.email, contact.phone)
+        self._index(contact)
+
+    def update(self, name, email=None, phone=None, new_name=None):
+        """Change the email, phone and/or name of a contact."""
+        contact = self._by_name[name]
+        new_name = contact.name if new_name is None else new_name
+        email = contact.email if email is None else email
+        phone = contact.phone if phone is None else phone
+        if new_name != name and new_name in self._by_name:
+            raise ValueError(f"Contact '{new_name}' already exists")
+
+        self._unindex(contact)
+        try:
+            self._check_unique(email, phone)
+        except ValueError:
+            self._index(contact)
+            raise
+        contact.name, contact.email, contact.phone = new_name, email, phone
+        self._index(contact)
+        return contact
+
+    def remove(self, name):
+        """Remove a contact and return it."""
+        contact = self._by_name[name]
+        self._unindex(contact)
+        return contact
+
+    def get(self, name, default=None):
+        return self._by_name.get(name, default)
+
+    def find_by_email(self, email):
+        name = self._by_email.get(normalize_email(email))
+        return None if name is None else self._by_name[name]
+
+    def find_by_phone(self, phone):
+        name = self._by_phone.get(normalize_phone(phone))
+        return None if name is None else self._by_name[name]
+
+    def search_prefix(self, prefix):
+        """Contacts whose name starts with prefix (case-insensitive), in sorted order."""
+        prefix = prefix.casefold()
+        result = []
+        for key in self._sorted[bisect_left(self._sorted, (prefix, "")):]:
+            if not key[0].startswith(prefix):
+                break
+            result.append(self._by_name[key[1]])
+        return result
+
+    def __getitem__(self, name):
+        return self._by_name[name]
+
+    def __delitem__(self, name):
+        self.remove(name)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __iter__(self):
+        """Contacts in name order; the order is kept up to date, never re-sorted."""
+        for _, name in self._sorted:
+            yield self._by_name[name]
+
+    def _check_unique(self, email, phone):
+        if normalize_email(email) in self._by_email:
+            raise ValueError(f"Email '{email}' is already used")
+        if normalize_phone(phone) in self._by_phone:
+            raise ValueError(f"Phone '{phone}' is already used")
+
+    def _index(self, contact):
+        self._by_name[contact.name] = contact
+        email, phone = normalize_email(contact.email), normalize_phone(contact.phone)
+        if email:
+            self._by_email[email] = contact.name
+        if phone:
+            self._by_phone[phone] = contact.name
+        insort(self._sorted, _sort_key(contact.name))
+
+    def _unindex(self, contact):
+        del self._by_name[contact.name]
+        email, phone = normalize_email(contact.email), normalize_phone(contact.phone)
+        if email:
+            del self._by_email[email]
+        if phone:
+            del self._by_phone[phone]
+        del self._sorted[bisect_left(self._sorted, _sort_key(contact.name))]
+
+
+if __name__ == "__main__":
+    book = ContactBook([
+        Contact("Alice", "alice@example.com", "+36-20-111-2222"),
+        Contact("Bob", "bob@example.com", "+36-30-333-4444"),
+        Contact("Charlie", "charlie@example.com", "+36-70-555-6666"),
+        Contact("alfred", "alfred@example.com", "+36-20-777-8888"),
+    ])
+
+    for contact in book:
+        print(contact)
+    print(book.find_by_email("BOB@example.com "))
+    print(book.find_by_phone("36 70 555 6666"))
+    print([c.name for c in book.search_prefix("al")])
+
+    book.update("Bob", phone="+36-30-999-0000")
+    del book["Charlie"]
+    print([c.name for c in book])
@@ -0,0 +1,210 @@
+"""Bulk contact import / export in chunks.
+
+`import_contacts` streams a CSV (header with name, email, phone columns)
+or JSON Lines file in chunks of `chunk_size` rows. Each chunk is split
+into columns and checked with `validation.validate_chunk` (the same rule
+as Contact.validate_email); valid rows go into a ContactArray, invalid
+rows into an optional reject file (CSV) together with the reasons. A
+JSONL line that is not valid JSON or not an object is rejected the same
+way instead of stopping the import. Blank lines are skipped.
+
+Usage: python contact_import.py INPUT [REJECTS] [OUTPUT]
+"""
+
+import csv
+import json
+import sys
+import time
+from dataclasses import dataclass
+from itertools import islice
+from operator import itemgetter
+
+from compact_contact import ContactArray
+from validation import validate_chunk
+
+FIELDS = ("name", "email", "phone")
+REJECT_FIELDS = ("row",) + FIELDS + ("reason",)
+CHUNK_SIZE = 10_000
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.rows:,} rows: {self.accepted:,} imported, {self.rejected:,} rejected "
+                f"in {self.seconds:.2f} s ({self.rows_per_sec:,.0f} rows/sec)")
+
+
+def _is_jsonl(path):
+    return path.endswith((".jsonl", ".ndjson"))
+
+
+def _drop_blank(items, blank, first):
+    """(non-blank items, their row numbers); rows are numbered from first."""
+    numbers = range(first, first + len(items))
+    if not any(blank):
+        return items, numbers
+    kept = [i for i, is_blank in enumerate(blank) if not is_blank]
+    return [items[i] for i in kept], [numbers[i] for i in kept]
+
+
+def _csv_chunks(f, chunk_size):
+    reader = csv.reader(f)
+    header = [column.strip().lower() for column in next(reader, [])]
+    missing = [field for field in FIELDS if field not in header]
+    if missing:
+        raise ValueError(f"CSV header has no {', '.join(missing)} column")
+    positions = [header.index(field) for field in FIELDS]
+    width = max(positions) + 1
+    getter = itemgetter(*positions)
+    first = 1
+    while rows := list(islice(reader, chunk_size)):
+        count = len(rows)
+        # A blank line is read as a row of at most one cell: only look for
+        # them (in Python) if the chunk has such rows at all
+        if min(map(len, rows)) <= 1:
+            rows, numbers = _drop_blank(
+                rows, [len(row) <= 1 and not "".join(row).strip() for row in rows], first)
+        else:
+            numbers = range(first, first + count)
+        first += count
+        if not rows:
+            continue
+        try:
+            yield list(map(getter, rows)), {}, numbers
+        except IndexError:
+            # Some rows are short: fill the missing cells with ""
+            yield [getter(row + [""] * (width - len(row))) for row in rows], {}, numbers
+
+
+def _parse_json_line(line):
+    """(record, None) for a JSON object line, ({}, reason) otherwise."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return {}, "invalid JSON"
+    if not isinstance(record, dict):
+        return {}, "not an object"
+    return record, None
+
+
+def _jsonl_chunks(f, chunk_size):
+    first = 1
+    while lines := list(islice(f, chunk_size)):
+        count = len(lines)
+        if all(map(str.strip, lines)):
+            numbers = range(first, first + count)
+        else:
+            lines, numbers = _drop_blank(lines, [not line.strip() for line in lines], first)
+        first += count
+        if not lines:
+            continue
+        errors = {}
+        try:
+            records = [json.loads(line) for line in lines]
+            rows = [tuple(str(record.get(field) or "") for field in FIELDS) for record in records]
+        except (ValueError, AttributeError):
+            # Some lines are not JSON objects: parse line by line to find them
+            records = []
+            for i, line in enumerate(lines):
+                record, reason = _parse_json_line(line)
+                if reason:
+                    errors[i] = reason
+                records.append(record)
+            rows = [tuple(str(record.get(field) or "") for field in FIELDS) for record in records]
+        yield rows, errors, numbers
+
+
+def read_chunks(f, path, chunk_size=CHUNK_SIZE):
+    """Yield (names, emails, phones, errors, numbers), up to chunk_size rows at a time.
+
+    Blank lines are skipped. errors maps the index of every row that could
+    not be read to the reason; such rows are empty in the columns. numbers
+    holds each row's number in the file, counted from 1 after the CSV
+    header; skipped blank lines keep their numbers.
+    """
+    chunks = _jsonl_chunks(f, chunk_size) if _is_jsonl(path) else _csv_chunks(f, chunk_size)
+    for rows, errors, numbers in chunks:
+        names, emails, phones = (list(map(str.strip, column)) for column in zip(*rows))
+        yield names, emails, phones, errors, numbers
+
+
+def import_contacts(path, rejects_path=None, chunk_size=CHUNK_SIZE, contacts=None):
+    """Import the valid rows of a CSV / JSONL file into a ContactArray.
+
+    Returns (contacts, ImportResult). Blank lines are skipped. Rows are
+    numbered from 1 (the CSV header is not counted, blank lines are) in
+    the reject file.
+    """
+    contacts = ContactArray() if contacts is None else contacts
+    result = ImportResult()
+    start = time.perf_counter()
+    rejects_file = open(rejects_path, "w", newline="", encoding="utf-8") if rejects_path else None
+    try:
+        rejects = csv.writer(rejects_file) if rejects_file else None
+        if rejects:
+            rejects.writerow(REJECT_FIELDS)
+        with open(path, newline="", encoding="utf-8") as f:
+            for names, emails, phones, errors, numbers in read_chunks(f, path, chunk_size):
+                reasons = validate_chunk(names, emails, phones)
+                reasons.update(errors)
+                if reasons:
+                    valid = [i for i in range(len(names)) if i not in reasons]
+                    if rejects:
+                        rejects.writerows(
+                            (numbers[i], names[i], emails[i], phones[i], reason)
+                            for i, reason in sorted(reasons.items()))
+                    names, emails, phones = ([column[i] for i in valid]
+                                             for column in (names, emails, phones))
+                contacts.extend(names, emails, phones)
+                result.rows += len(names) + len(reasons)
+                result.accepted += len(names)
+                result.rejected += len(reasons)
+    finally:
+        if rejects_file:
+            rejects_file.close()
+    result.seconds = time.perf_counter() - start
+    return contacts, result
+
+
+def export_contacts(contacts, path, chunk_size=CHUNK_SIZE):
+    """Write contacts (a ContactArray or any contact objects) as CSV or JSONL."""
+    if isinstance(contacts, ContactArray):
+        rows = contacts.rows()
+    else:
+        rows = ((contact.name, contact.email, contact.phone) for contact in contacts)
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if _is_jsonl(path):
+            while chunk := list(islice(rows, chunk_size)):
+                f.write("".join(json.dumps(dict(zip(FIELDS, row))) + "\n" for row in chunk))
+                count += len(chunk)
+        else:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            while chunk := list(islice(rows, chunk_size)):
+                writer.writerows(chunk)
+                count += len(chunk)
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(1)
+    input_file = sys.argv[1]
+    rejects_file = sys.argv[2] if len(sys.argv) > 2 else None
+    output_file = sys.argv[3] if len(sys.argv) > 3 else None
+
+    contacts, result = import_contacts(input_file, rejects_file)
+    print(result)
+    if output_file:
+        print(f"{export_contacts(contacts, output_file):,} contacts written to {output_file}")
@@ -1,20 +1,4 @@
-class Contact:
-    # Initialize the Contact class with name, email, and phone attributes
-    # constructor method to set the attributes when a new Contact object is created
-    def __init__(self, name, email, phone):
-        self.name = name
-        self.email = email
-        self.phone = phone
-
-    def validate_email(self):
-        # Simple email validation: check if it contains "@" and "."
-        if "@" in self.email and "." in self.email:
-            return True
-        return False
-
-    def __str__(self):
-        return f"Contact(name={self.name}, email={self.email}, phone={self.phone})"
-
+from contact import Contact
 
 # same data with dictionary:
 contact_d1 = {"name": "Alice",
@@ -0,0 +1,58 @@
+# validation.py - The one email / phone rule used by every contact class
+#
+# Contact.validate_email, CompactContact.validate_email and the bulk
+# importer all use these patterns (conditionals/util.py has a copy of the
+# email rule). The rules:
+#   email: exactly one "@", something before it, and a domain made of at
+#          least two non-empty parts separated by dots; no spaces
+#   phone: 7-15 digits (the E.164 maximum), optional leading "+",
+#          digits may be separated by spaces, "-", "(" or ")"
+#
+# validate_chunk checks whole columns with map() over the compiled
+# patterns and only looks at the failed rows in Python, so a chunk of valid
+# rows never runs Python code per row.
+
+import re
+
+EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s.]+(?:\.[^@\s.]+)+")
+PHONE_PATTERN = re.compile(r"\+?\(?[0-9](?:[ ()-]*[0-9]){6,14}\)?")
+
+
+def is_valid_email(email):
+    return EMAIL_PATTERN.fullmatch(email) is not None
+
+
+def is_valid_phone(phone):
+    return PHONE_PATTERN.fullmatch(phone) is not None
+
+
+def _positions(values, missing):
+    """Indexes of `missing` in values; list.index does the scanning in C."""
+    positions = []
+    i = -1
+    while True:
+        try:
+            i = values.index(missing, i + 1)
+        except ValueError:
+            return positions
+        positions.append(i)
+
+
+def validate_chunk(names, emails, phones):
+    """Return the reason for every invalid row as {row index: reason}.
+
+    The three lists are the columns of one chunk; rows not in the result
+    are valid.
+    """
+    reasons = {}
+
+    def reject(i, reason):
+        reasons[i] = f"{reasons[i]}; {reason}" if i in reasons else reason
+
+    for i in _positions(names, ""):
+        reject(i, "missing name")
+    for i in _positions(list(map(EMAIL_PATTERN.fullmatch, emails)), None):
+        reject(i, "invalid email" if emails[i] else "missing email")
+    for i in _positions(list(map(PHONE_PATTERN.fullmatch, phones)), None):
+        reject(i, "invalid phone" if phones[i] else "missing phone")
+    return reasons
@@ -0,0 +1,61 @@
+"""Benchmark doubling an n x n matrix: loops vs comprehension vs Matrix.
+
+Times only the doubling (building the input is not counted) for
+  - nested for / append loops (matrix2 in main.py)
+  - a nested list comprehension (matrix3 in main.py)
+  - Matrix * 2 with the array backend
+  - Matrix * 2 with the NumPy backend (if NumPy is installed)
+
+Usage: python bench_matrix.py [n ...]
+"""
+
+import sys
+import time
+
+from matrix import HAVE_NUMPY, Matrix
+
+
+def double_loops(matrix):
+    matrix2 = []
+    for row in matrix:
+        new_row = []
+        for item in row:
+            new_row.append(item * 2)
+        matrix2.append(new_row)
+    return matrix2
+
+
+def double_comprehension(matrix):
+    return [[item * 2 for item in row] for row in matrix]
+
+
+def timed(func, arg):
+    start = time.perf_counter()
+    result = func(arg)
+    return time.perf_counter() - start, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 3000]
+    backends = ["array"] + (["numpy"] if HAVE_NUMPY else [])
+    columns = ["loops", "comprehension"] + backends
+    print(f"{'n':>6} " + " ".join(f"{name:>14}" for name in columns) + "   (seconds)")
+
+    for n in sizes:
+        matrix = [[i * n + j for j in range(n)] for i in range(n)]
+        times = []
+        loop_time, expected = timed(double_loops, matrix)
+        times.append(loop_time)
+        comprehension_time, result = timed(double_comprehension, matrix)
+        assert result == expected
+        times.append(comprehension_time)
+        for backend in backends:
+            m = Matrix(matrix, backend=backend)
+            backend_time, result = timed(lambda m: m * 2, m)
+            assert result.tolist() == expected
+            times.append(backend_time)
+        print(f"{n:>6} " + " ".join(f"{t:>14.4f}" for t in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark out_of_core.transform_file: MB/s and peak memory vs file size.
+
+Creates matrix files of doubles of growing size and doubles every number
+with 1 worker and with all CPUs. Each run happens in a fresh process so its
+peak memory (VmHWM; for the pool, the largest worker) can be reported next
+to the file size.
+
+Usage: python bench_out_of_core.py [megabytes ...]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from array import array
+
+from out_of_core import create_matrix_file, np
+
+COLS = 4096
+
+RUN = """
+import resource, sys
+from out_of_core import double, np, transform_file
+stats = transform_file(sys.argv[1], sys.argv[2], double, workers=int(sys.argv[3]),
+                       vectorized=np is not None)
+with open("/proc/self/status") as f:
+    own = next(int(line.split()[1]) for line in f if line.startswith("VmHWM"))
+children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+print(stats.mb_per_s, max(own, children) / 1024)
+"""
+
+
+def fill(path, megabytes):
+    rows = megabytes * 1_000_000 // (COLS * 8)
+    with create_matrix_file(path, rows, COLS) as matrix:
+        for start in range(0, rows, 256):
+            stop = min(start + 256, rows)
+            block = matrix.rows_view(start, stop)
+            if np is not None:
+                block[...] = 1.5
+            else:
+                block[:] = array("d", [1.5]) * (COLS * (stop - start))
+            del block
+            matrix.release(start, stop)
+    return rows
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 500, 2000]
+    cpus = os.cpu_count() or 1
+    print(f"{'file MB':>8} {'workers':>8} {'MB/s':>9} {'peak RSS MB':>12}")
+    with tempfile.TemporaryDirectory(dir=".") as tmp:
+        for megabytes in sizes:
+            source = os.path.join(tmp, "source.bin")
+            target = os.path.join(tmp, "target.bin")
+            fill(source, megabytes)
+            for workers in sorted({1, cpus}):
+                output = subprocess.run([sys.executable, "-c", RUN, source, target, str(workers)],
+                                        capture_output=True, text=True, check=True).stdout
+                mb_per_s, peak = map(float, output.split())
+                print(f"{megabytes:>8} {workers:>8} {mb_per_s:>9.0f} {peak:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from matrix import Matrix
+
 matrix = [
     [1, 2, 3, 0],
     [4, 5, 6, 1],
@@ -15,3 +17,7 @@ print(matrix2)
 
 matrix3 = [[item * 2 for item in row] for row in matrix]
 print(matrix3)
+
+# same with the Matrix class (NumPy if installed), see matrix.py
+matrix4 = Matrix(matrix) * 2
+print(matrix4.tolist())
@@ -0,0 +1,193 @@
+# matrix.py - Small matrix type for element-wise work on big grids
+#
+# main.py doubles a matrix with nested loops and with a nested list
+# comprehension; both touch every number from Python. Matrix keeps the
+# numbers in one compact block instead of a list of lists:
+#   - a NumPy array when NumPy is installed (pip install numpy)
+#   - otherwise an array.array ("q" for whole numbers, "d" for floats),
+#     row by row, worked on with map() / slicing so the loops run in C
+#
+# NumPy is what makes element-wise work fast (see bench_matrix.py). The
+# array fallback trades time for memory: it is 2-3x slower than the
+# comprehension (every number is boxed into an int or float object and
+# unboxed again), but it needs only 8 bytes per number instead of a
+# pointer plus an int or float object.
+#
+# Supported: + - * / with another matrix of the same shape or a number,
+# negation, sum / min / max of everything, of each column (axis=0) or of
+# each row (axis=1), and transpose (.T).
+
+import operator
+from array import array
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+
+class Matrix:
+    def __init__(self, rows, backend=None):
+        """Matrix from a list of equally long rows.
+
+        backend: "numpy", "array" or None (NumPy if it is installed).
+        """
+        backend = backend or ("numpy" if HAVE_NUMPY else "array")
+        if backend == "numpy" and not HAVE_NUMPY:
+            raise ValueError("NumPy is not installed")
+        if backend not in ("numpy", "array"):
+            raise ValueError(f"Unknown backend {backend!r}")
+        rows = [list(row) for row in rows]
+        n_cols = len(rows[0]) if rows else 0
+        if any(len(row) != n_cols for row in rows):
+            raise ValueError("All rows must have the same length")
+        if backend == "numpy":
+            self._data = np.array(rows).reshape(len(rows), n_cols)
+        else:
+            values = [item for row in rows for item in row]
+            typecode = "q" if all(isinstance(item, int) for item in values) else "d"
+            self._data = array(typecode, values)
+        self._shape = (len(rows), n_cols)
+
+    @classmethod
+    def _wrap(cls, data, shape):
+        matrix = cls.__new__(cls)
+        matrix._data = data
+        matrix._shape = shape
+        return matrix
+
+    @property
+    def backend(self):
+        return "array" if isinstance(self._data, array) else "numpy"
+
+    @property
+    def shape(self):
+        return self._shape
+
+    def tolist(self):
+        """The matrix as a list of lists (like the matrices in main.py)."""
+        if self.backend == "numpy":
+            return self._data.tolist()
+        n_rows, n_cols = self._shape
+        return [self._data[i * n_cols:(i + 1) * n_cols].tolist() for i in range(n_rows)]
+
+    def __getitem__(self, index):
+        i, j = index
+        if self.backend == "numpy":
+            return self._data[i, j].item()
+        return self._data[i * self._shape[1] + j]
+
+    def __eq__(self, other):
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return self._shape == other._shape and self.tolist() == other.tolist()
+
+    def __repr__(self):
+        return f"Matrix({self.tolist()!r})"
+
+    # Element-wise operations
+
+    def _operand(self, other):
+        """other as a number or as data in this matrix's backend."""
+        if isinstance(other, (int, float)):
+            return other
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        if other._shape != self._shape:
+            raise ValueError(f"Shapes {self._shape} and {other._shape} do not match")
+        if other.backend == self.backend:
+            return other._data
+        if self.backend == "numpy":
+            return np.array(other._data).reshape(other._shape)
+        return array("d" if other._data.dtype.kind == "f" else "q", other._data.ravel().tolist())
+
+    def _elementwise(self, op, other, reverse=False):
+        operand = self._operand(other)
+        if operand is NotImplemented:
+            return NotImplemented
+        if self.backend == "numpy":
+            data = op(operand, self._data) if reverse else op(self._data, operand)
+            return self._wrap(data, self._shape)
+
+        left = repeat(operand) if isinstance(operand, (int, float)) else operand
+        right = self._data
+        if not reverse:
+            left, right = right, left
+        floats = (op is operator.truediv or self._data.typecode == "d"
+                  or isinstance(operand, float) or getattr(operand, "typecode", "q") == "d")
+        return self._wrap(array("d" if floats else "q", map(op, left, right)), self._shape)
+
+    def __add__(self, other):
+        return self._elementwise(operator.add, other)
+
+    def __radd__(self, other):
+        return self._elementwise(operator.add, other, reverse=True)
+
+    def __sub__(self, other):
+        return self._elementwise(operator.sub, other)
+
+    def __rsub__(self, other):
+        return self._elementwise(operator.sub, other, reverse=True)
+
+    def __mul__(self, other):
+        return self._elementwise(operator.mul, other)
+
+    def __rmul__(self, other):
+        return self._elementwise(operator.mul, other, reverse=True)
+
+    def __truediv__(self, other):
+        return self._elementwise(operator.truediv, other)
+
+    def __rtruediv__(self, other):
+        return self._elementwise(operator.truediv, other, reverse=True)
+
+    def __neg__(self):
+        return self * -1
+
+    # Reductions
+
+    def _reduce(self, func, np_func, axis):
+        if self.backend == "numpy":
+            result = np_func(self._data, axis=axis)
+            return result.item() if axis is None else result.tolist()
+        n_rows, n_cols = self._shape
+        if axis is None:
+            return func(self._data)
+        if axis == 0:
+            return [func(self._data[j::n_cols]) for j in range(n_cols)]
+        if axis == 1:
+            return [func(self._data[i * n_cols:(i + 1) * n_cols]) for i in range(n_rows)]
+        raise ValueError("axis must be None, 0 (columns) or 1 (rows)")
+
+    def sum(self, axis=None):
+        return self._reduce(sum, np and np.sum, axis)
+
+    def min(self, axis=None):
+        return self._reduce(min, np and np.min, axis)
+
+    def max(self, axis=None):
+        return self._reduce(max, np and np.max, axis)
+
+    @property
+    def T(self):
+        """The transpose (rows become columns)."""
+        n_rows, n_cols = self._shape
+        if self.backend == "numpy":
+            return self._wrap(self._data.T, (n_cols, n_rows))
+        data = array(self._data.typecode)
+        for j in range(n_cols):
+            data.extend(self._data[j::n_cols])
+        return self._wrap(data, (n_cols, n_rows))
+
+
+if __name__ == "__main__":
+    for backend in (["numpy"] if HAVE_NUMPY else []) + ["array"]:
+        m = Matrix([[1, 2, 3, 0], [4, 5, 6, 1], [7, 8, 9, 0]], backend=backend)
+        print(f"--- {backend} ---")
+        print((m * 2).tolist())
+        print((m + m - 1).tolist())
+        print(m.sum(), m.sum(axis=0), m.max(axis=1))
+        print(m.T.tolist())
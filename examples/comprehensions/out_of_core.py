@@ -0,0 +1,241 @@
+# out_of_core.py - Element-wise transforms of matrices stored in files
+#
+# main.py keeps the whole matrix in memory as lists. For matrices bigger
+# than the RAM, the numbers live in a binary file instead:
+#
+#   32-byte header: b"MATRIX01", rows, cols (little-endian uint64 each),
+#                   array typecode ("d", "q", ...) and padding
+#   data:           rows * cols numbers, row by row
+#
+# transform_file maps the input and the output file into memory (mmap) and
+# works through them a block of rows at a time. A block is sized so that
+# its input and output fit in the CPU's L2 cache. Pages that are done are
+# handed back to the operating system, so the memory used stays bounded
+# whatever the size of the file. With workers > 1 the rows are split
+# between processes, each mapping the files itself.
+#
+# The transform is an element-wise function like `lambda item: item * 2`,
+# called once per number. With NumPy installed, vectorized=True calls it
+# once per block with a NumPy array instead, which is much faster for
+# functions that work on whole arrays (item * 2 does, max(item, 0) does
+# not). Either way, results that do not fit the target's typecode (a
+# float for a "q" matrix) raise TypeError instead of being truncated.
+
+import mmap
+import os
+import struct
+import time
+import traceback
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"MATRIX01"
+HEADER = struct.Struct("<8sQQ1s7x")
+DEFAULT_CACHE_BYTES = 1024 * 1024
+RELEASE_BYTES = 32 * 1024 * 1024  # give finished pages back every 32 MB
+
+
+def double(item):
+    """The transform from main.py; module level, so worker processes can use it."""
+    return item * 2
+
+
+def cache_size(level=2):
+    """Size of the CPU cache of this level in bytes (DEFAULT_CACHE_BYTES if unknown)."""
+    base = "/sys/devices/system/cpu/cpu0/cache"
+    try:
+        for index in sorted(os.listdir(base)):
+            with open(os.path.join(base, index, "level")) as f:
+                if int(f.read()) != level:
+                    continue
+            with open(os.path.join(base, index, "size")) as f:
+                size = f.read().strip()
+            units = {"K": 1024, "M": 1024 * 1024}
+            return int(size[:-1]) * units[size[-1]] if size[-1] in units else int(size)
+    except (OSError, ValueError):
+        pass
+    return DEFAULT_CACHE_BYTES
+
+
+def block_rows(cols, itemsize, cache_bytes=None):
+    """Rows per block so that one input block and one output block fit in the cache."""
+    cache_bytes = cache_bytes or cache_size()
+    return max(1, cache_bytes // 2 // max(1, cols * itemsize))
+
+
+def create_matrix_file(path, rows, cols, typecode="d"):
+    """Create a matrix file of zeros (sparse on most file systems) and return it mapped."""
+    itemsize = array(typecode).itemsize
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, rows, cols, typecode.encode()))
+        f.truncate(HEADER.size + rows * cols * itemsize)
+    return MatrixFile(path, writable=True)
+
+
+def write_matrix_file(path, matrix, typecode="d"):
+    """Write a list of lists (like `matrix` in main.py) to a matrix file."""
+    rows, cols = len(matrix), len(matrix[0]) if matrix else 0
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, rows, cols, typecode.encode()))
+        for row in matrix:
+            array(typecode, row).tofile(f)
+
+
+class MatrixFile:
+    """A matrix file mapped into memory; `values` is a flat memoryview of the numbers."""
+
+    def __init__(self, path, writable=False):
+        with open(path, "r+b" if writable else "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size or not header.startswith(MAGIC):
+                raise ValueError(f"{path} is not a matrix file")
+            _, self.rows, self.cols, typecode = HEADER.unpack(header)
+            self.typecode = typecode.decode()
+            self.itemsize = array(self.typecode).itemsize
+            self._mmap = mmap.mmap(f.fileno(), 0,
+                                   access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        self.values = memoryview(self._mmap)[HEADER.size:].cast(self.typecode)
+
+    def flat_view(self, start, stop):
+        """The numbers of rows start..stop-1 as a flat memoryview."""
+        return self.values[start * self.cols:stop * self.cols]
+
+    def rows_view(self, start, stop):
+        """Rows start..stop-1: a NumPy array if NumPy is installed, else a memoryview."""
+        values = self.flat_view(start, stop)
+        if np is not None:
+            return np.frombuffer(values, dtype=self.typecode).reshape(stop - start, self.cols)
+        return values
+
+    def release(self, start_row, stop_row):
+        """Tell the OS the pages of these rows are not needed in memory now."""
+        if not hasattr(mmap, "MADV_DONTNEED"):
+            return
+        start = HEADER.size + start_row * self.cols * self.itemsize
+        stop = HEADER.size + stop_row * self.cols * self.itemsize
+        start = -(-start // mmap.PAGESIZE) * mmap.PAGESIZE  # only whole pages
+        stop = stop // mmap.PAGESIZE * mmap.PAGESIZE
+        if stop > start:
+            self._mmap.madvise(mmap.MADV_DONTNEED, start, stop - start)
+
+    def tolist(self):
+        return [self.values[i * self.cols:(i + 1) * self.cols].tolist() for i in range(self.rows)]
+
+    def close(self):
+        self.values.release()
+        self._mmap.flush()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+@dataclass
+class TransformStats:
+    bytes: int
+    seconds: float
+
+    @property
+    def mb_per_s(self):
+        """Input megabytes transformed per second."""
+        return self.bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+
+def _apply_vectorized(func, block, out):
+    result = np.asarray(func(block))
+    if result.shape != block.shape:
+        raise ValueError(f"func returned shape {result.shape} for a block of shape {block.shape}")
+    if not np.can_cast(result.dtype, out.dtype, casting="same_kind"):
+        raise TypeError(f"func returned {result.dtype} values for a {out.dtype} matrix")
+    out[...] = result
+
+
+def _transform_rows(source_path, target_path, func, start, stop, rows_per_block, vectorized):
+    """Worker: transform rows start..stop-1 of source into target."""
+    view = "rows_view" if vectorized else "flat_view"
+    with MatrixFile(source_path) as source, MatrixFile(target_path, writable=True) as target:
+        released = start
+        for block_start in range(start, stop, rows_per_block):
+            block_stop = min(block_start + rows_per_block, stop)
+            block = getattr(source, view)(block_start, block_stop)
+            out = getattr(target, view)(block_start, block_stop)
+            try:
+                if vectorized:
+                    _apply_vectorized(func, block, out)
+                else:
+                    # array() raises TypeError for a number of the wrong kind
+                    out[:] = array(target.typecode, map(func, block))
+            except BaseException as error:
+                # The frames of func in the traceback still hold the views
+                traceback.clear_frames(error.__traceback__)
+                raise
+            finally:
+                del block, out  # the views must go before the files can close
+            if (block_stop - released) * source.cols * source.itemsize >= RELEASE_BYTES:
+                source.release(released, block_stop)
+                target.release(released, block_stop)
+                released = block_stop
+
+
+def transform_file(source_path, target_path, func, workers=1, rows_per_block=None, typecode=None,
+                   vectorized=False):
+    """Apply func to every number of a matrix file, writing a new matrix file.
+
+    func is called with one number at a time, or with vectorized=True
+    (needs NumPy) with a NumPy array of a block of rows. It must be a
+    module-level function (not a lambda) when workers > 1, because it is
+    sent to other processes. The target must be a different
+    file: it is created (zeroed) before the source is read. Returns
+    TransformStats.
+    """
+    start_time = time.perf_counter()
+    if vectorized and np is None:
+        raise ValueError("vectorized=True needs NumPy")
+    if os.path.abspath(source_path) == os.path.abspath(target_path) or (
+            os.path.exists(target_path) and os.path.samefile(source_path, target_path)):
+        raise ValueError("source_path and target_path must be different files")
+    with MatrixFile(source_path) as source:
+        rows, cols, itemsize = source.rows, source.cols, source.itemsize
+        create_matrix_file(target_path, rows, cols, typecode or source.typecode).close()
+    if rows * cols == 0:
+        return TransformStats(0, time.perf_counter() - start_time)
+    rows_per_block = rows_per_block or block_rows(cols, itemsize)
+
+    if workers == 1:
+        _transform_rows(source_path, target_path, func, 0, rows, rows_per_block, vectorized)
+    else:
+        workers = workers or os.cpu_count() or 1
+        step = -(-rows // workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_transform_rows, source_path, target_path, func,
+                                       start, min(start + step, rows), rows_per_block, vectorized)
+                       for start in range(0, rows, step)]
+            for future in futures:
+                future.result()
+    return TransformStats(rows * cols * itemsize, time.perf_counter() - start_time)
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    matrix = [
+        [1, 2, 3, 0],
+        [4, 5, 6, 1],
+        [7, 8, 9, 0],
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        source_path = os.path.join(tmp, "matrix.bin")
+        target_path = os.path.join(tmp, "matrix2.bin")
+        write_matrix_file(source_path, matrix, typecode="q")
+        transform_file(source_path, target_path, lambda item: item * 2)
+        with MatrixFile(target_path) as result:
+            print(result.tolist())
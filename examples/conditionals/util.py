@@ -1,18 +1,21 @@
 # utils.py - Utility functions
 
+import re
+
+
 def format_price(amount, currency="$"):
     """Format a number as a price string."""
     return f"{currency}{amount:,.2f}"
 
 
+# Same rule as examples/classes/validation.py: exactly one "@", something
+# before it, a domain of non-empty parts separated by dots, and no spaces
+EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s.]+(?:\.[^@\s.]+)+")
+
+
 def validate_email(email):
-    """Basic email validation: must contain @ and a dot after @."""
-    if "@" not in email:
-        return False
-    parts = email.split("@")
-    if len(parts) != 2:
-        return False
-    return "." in parts[1]
+    """Basic email validation: one @ and a dot in the domain after it."""
+    return EMAIL_PATTERN.fullmatch(email) is not None
 
 
 TAX_RATE = 0.20
@@ -0,0 +1,73 @@
+"""Benchmark top-N ranking over synthetic JSON Lines input of growing size.
+
+Compares loading everything and sorting with the bounded heap, scanned in
+one process and in a process pool.
+
+Usage: python bench_ranking.py [n_records ...]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from ranking import top_n_customers_jsonl
+
+KEY = "total_purchases"
+TOP_N = 10
+
+
+def write_synthetic(path: str, n: int) -> None:
+    rng = random.Random(42)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            customer = {
+                "customer_id": i,
+                "first_name": "Customer",
+                "last_name": str(i),
+                "email": f"customer{i}@email.com",
+                "age": rng.randint(18, 90),
+                KEY: round(rng.uniform(0, 10_000), 2),
+                "loyalty_level": rng.choice(["Bronze", "Silver", "Gold"]),
+            }
+            f.write(json.dumps(customer) + "\n")
+
+
+def sort_everything(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        customers = [json.loads(line) for line in f]
+    return sorted(customers, key=lambda c: c[KEY], reverse=True)[:TOP_N]
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 300_000, 1_000_000]
+    workers = os.cpu_count() or 1
+    print(f"top {TOP_N} by {KEY}, {workers} worker(s) for the parallel scan")
+    print(f"{'records':>10} {'MB':>7} {'sort all':>9} {'heap':>9} {'parallel':>9}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = os.path.join(tmp, f"customers_{n}.jsonl")
+            write_synthetic(path, n)
+            size = os.path.getsize(path)
+
+            sort_time, expected = timed(sort_everything, path)
+            heap_time, serial = timed(top_n_customers_jsonl, path, KEY, TOP_N, workers=1)
+            parallel_time, parallel = timed(top_n_customers_jsonl, path, KEY, TOP_N,
+                                            workers=workers, chunk_size=max(1, size // workers))
+            assert serial == parallel
+            assert [c[KEY] for c in serial] == [c[KEY] for c in expected]
+
+            print(f"{n:>10,} {size / 1e6:>7.1f} {sort_time:>8.2f}s {heap_time:>8.2f}s {parallel_time:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,175 @@
+import argparse
 import json
-import msvcrt
+import logging
+import os
+import sys
+import time
 
-user_input = None
-top_n = None
-root = {}
-customers = []
-input_file = "customers.json"
-output_file = "top_customers.json"
+from ranking import rank_customers, top_n_by
+from streaming import stream_top_customers
+
+DEFAULT_INPUT = "customers.json"
+DEFAULT_OUTPUT = "top_customers.json"
+
+logger = logging.getLogger("top_customers")
+
+
+def parse_args(argv=None):
+    """Read options from the command line, falling back to environment variables."""
+    parser = argparse.ArgumentParser(
+        description="Write the top N customers of a customers file to a new file.")
+    parser.add_argument("--top-n", type=int, default=os.environ.get("TOP_N"),
+                        help="number of customers to keep (env: TOP_N); asked for if missing")
+    parser.add_argument("--by", default=os.environ.get("TOP_N_BY"),
+                        help="rank by this field instead of file order, e.g. total_purchases (env: TOP_N_BY)")
+    parser.add_argument("--input", default=os.environ.get("CUSTOMERS_INPUT", DEFAULT_INPUT),
+                        help=f"input .json or .jsonl file (env: CUSTOMERS_INPUT, default: {DEFAULT_INPUT})")
+    parser.add_argument("--output", default=os.environ.get("CUSTOMERS_OUTPUT", DEFAULT_OUTPUT),
+                        help=f"output file (env: CUSTOMERS_OUTPUT, default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--workers", type=int, default=os.environ.get("WORKERS") or None,
+                        help="processes that scan a .jsonl input with --by (env: WORKERS, default: all CPUs)")
+    parser.add_argument("--watch", action="store_true",
+                        help="service mode: wait for the input file and process every new version")
+    parser.add_argument("--once", action="store_true",
+                        help="with --watch, exit after the first file has been processed")
+    parser.add_argument("--poll-interval", type=float, default=os.environ.get("POLL_INTERVAL", "0.5"),
+                        help="first wait between checks for the input file, in seconds (env: POLL_INTERVAL)")
+    parser.add_argument("--max-poll-interval", type=float, default=30.0,
+                        help="the wait doubles up to this many seconds while nothing changes")
+    args = parser.parse_args(argv)
+    if args.top_n is not None:
+        args.top_n = int(args.top_n)
+        if args.top_n < 0:
+            parser.error("--top-n must not be negative")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    # 0 would never grow by doubling (a busy loop), and sleep rejects negatives
+    if args.poll_interval <= 0:
+        parser.error("--poll-interval must be positive")
+    if args.max_poll_interval <= 0:
+        parser.error("--max-poll-interval must be positive")
+    if args.max_poll_interval < args.poll_interval:
+        parser.error("--max-poll-interval must not be less than --poll-interval")
+    return args
+
+
+def process_file(input_file, output_file, top_n, by=None, workers=None):
+    """Write the top N customers of input_file and log how long it took.
+
+    With `by`, a JSON Lines input is scanned by `workers` processes
+    (None: all CPUs).
+    """
+    start = time.perf_counter()
+    if by:
+        written = rank_customers(input_file, output_file, by, top_n, workers)
+    else:
+        written = stream_top_customers(input_file, output_file, top_n)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info("Wrote top %d customers of %s to %s in %.1f ms",
+                written, input_file, output_file, elapsed_ms)
+    return written
+
+
+def _file_version(path):
+    """(mtime, size) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def watch(input_file, output_file, top_n, by=None, poll_interval=0.5,
+          max_poll_interval=30.0, once=False, workers=None):
+    """Poll for input_file and process it every time a new version lands.
+
+    The wait between checks starts at poll_interval and doubles (up to
+    max_poll_interval) while nothing changes. A file is processed once its
+    size and modification time are the same on two checks in a row, so a
+    file that is still being written is not read half-way.
+    """
+    logger.info("Watching for %s", input_file)
+    processed = None
+    seen = None
+    detected = None  # when the change being waited for was first seen
+    interval = poll_interval
+    while True:
+        version = _file_version(input_file)
+        if version is not None and version != processed:
+            if version == seen:
+                try:
+                    process_file(input_file, output_file, top_n, by, workers)
+                except (ValueError, OSError) as error:
+                    logger.error("Could not process %s: %s", input_file, error)
+                logger.info("Latency from detected change to output: %.1f ms",
+                            (time.perf_counter() - detected) * 1000)
+                processed = version
+                detected = None
+                interval = poll_interval
+                if once:
+                    return
+                continue
+            # New or still growing: check again soon
+            if detected is None:
+                detected = time.perf_counter()
+            seen = version
+            interval = poll_interval
+        else:
+            interval = min(interval * 2, max_poll_interval)
+        time.sleep(interval)
+
+
+def ask_top_n(input_file):
+    """Ask for N until a valid number is entered; returns (N, customers)."""
+    user_input = None
+    customers = None
+    while True:
+        try:
+            if customers is None:
+                with open(input_file, "r", encoding="utf-8") as f:
+                    customers = json.load(f).get("customers", [])
+            user_input = input(
+                f"Enter a integer number for top n customers: (0-{len(customers)}): ")
+            top_n = int(user_input)
+            if top_n < 0 or top_n > len(customers):
+                print(
+                    f"Number must be between 0 and {len(customers)} and you entered {top_n}")
+                continue
+            return top_n, customers
+        except ValueError:
+            print(f"Invalid number {user_input}")
+        except FileNotFoundError:
+            print(f"File not found: {input_file} from the current directory")
+            # wait for the user to fix the problem and try again
+            input("Press Enter to continue...")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.watch:
+        if args.top_n is None:
+            sys.exit("--top-n (or TOP_N) is required with --watch")
+        watch(args.input, args.output, args.top_n, args.by,
+              args.poll_interval, args.max_poll_interval, args.once, args.workers)
+        return
+
+    if args.top_n is None:
+        # Interactive: business logic works with the number entered
+        top_n, customers = ask_top_n(args.input)
+        print(f"Number was: {top_n}")
+        top_n_customers = top_n_by(customers, args.by, top_n) if args.by else customers[:top_n]
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"customers": top_n_customers}, f, indent=4)
+        print(f"Top {top_n} customers were written to {args.output}")
+        return
 
-while True:
     try:
-        if not root:
-            with open(input_file, "r", encoding="utf-8") as f:
-                root = json.load(f)
-                customers = root.get("customers", [])
-        user_input = input(
-            f"Enter a integer number for top n customers: (0-{len(customers)}): ")
-        top_n = int(user_input)
-        if top_n < 0 or top_n > len(customers):
-            print(
-                f"Number must be between 0 and {len(customers)} and you entered {top_n}")
-            continue
-        break
-    except ValueError:
-        print(f"Invalid number {user_input}")
+        process_file(args.input, args.output, args.top_n, args.by, args.workers)
     except FileNotFoundError:
-        print(f"File not found: {input_file} from the current directory")
-        # wait for the user to fix the problem and try again, press any key to continue
-        print("Press any key to continue...")
-        msvcrt.getch()
-    # except IOError:
-    #     print("File not found")
-
-# business logig: woring with the number
-print(f"Number was: {top_n}")
-top_n_customers = customers[:top_n]
-top_n_root = {
-    "customers": top_n_customers
-}
-
-with open(output_file, "w", encoding="utf-8") as f:
-    json.dump(top_n_root, f, indent=4)
-print(f"Top {top_n} customers were written to {output_file}")
+        sys.exit(f"File not found: {args.input}")
+
+
+if __name__ == "__main__":
+    main()
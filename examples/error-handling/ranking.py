@@ -0,0 +1,122 @@
+"""Top-N customers by a field, e.g. total_purchases.
+
+`top_n_by` keeps a min-heap of at most N records while scanning, so it
+needs O(N) memory and O(len * log N) time however many customers there are.
+
+For JSON Lines input `top_n_customers_jsonl` can also split the file into
+byte ranges and scan them in a process pool. Each worker returns its own
+top N and the results are merged. A line belongs to the range where it
+starts; ties are broken by position in the file (earlier wins), so the
+result is the same for any number of workers.
+
+Usage: python ranking.py KEY TOP_N [input_file] [output_file] [workers]
+"""
+
+import heapq
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+from streaming import iter_customers, write_customers
+
+# (key value, -position, record): larger is better, earlier wins ties
+Ranked = Tuple[float, int, dict]
+
+
+def _push(heap: List[Ranked], item: Ranked, n: int) -> None:
+    """Add an item to a bounded min-heap of the n best items."""
+    if len(heap) < n:
+        heapq.heappush(heap, item)
+    elif item[:2] > heap[0][:2]:
+        heapq.heapreplace(heap, item)
+
+
+def _best_first(heap: List[Ranked], n: int) -> List[Ranked]:
+    return heapq.nlargest(n, heap, key=lambda item: item[:2])
+
+
+def top_n_by(customers: Iterable[dict], key: str, n: int) -> List[dict]:
+    """Return the n customers with the largest `key`, largest first.
+
+    Customers without a numeric `key` are skipped.
+    """
+    heap: List[Ranked] = []
+    if n > 0:
+        for position, customer in enumerate(customers):
+            value = customer.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                _push(heap, (value, -position, customer), n)
+    return [record for _, _, record in _best_first(heap, n)]
+
+
+def _scan_range(path: str, start: int, end: int, key: str, n: int) -> List[Ranked]:
+    """Worker: top n of the JSON Lines records that start in [start, end)."""
+    heap: List[Ranked] = []
+    with open(path, "rb") as f:
+        if start > 0:
+            # Skip to the first line that starts at or after `start`
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        for line in f:
+            if position >= end:
+                break
+            if line.strip():
+                customer = json.loads(line)
+                value = customer.get(key)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    _push(heap, (value, -position, customer), n)
+            position += len(line)
+    return _best_first(heap, n)
+
+
+def top_n_customers_jsonl(path: str, key: str, n: int, workers: Optional[int] = 1,
+                          chunk_size: int = 64 * 1024 * 1024) -> List[dict]:
+    """Top n customers of a JSON Lines file, scanned in byte-range chunks.
+
+    `workers=1` scans in this process; otherwise chunks go to a process
+    pool (`workers=None` uses all CPUs).
+    """
+    if n <= 0:
+        return []
+    size = os.path.getsize(path)
+    ranges = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+    if workers == 1:
+        partials = [_scan_range(path, start, end, key, n) for start, end in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_scan_range, path, start, end, key, n) for start, end in ranges]
+            partials = [future.result() for future in futures]
+
+    merged = heapq.nlargest(n, (item for partial in partials for item in partial),
+                            key=lambda item: item[:2])
+    return [record for _, _, record in merged]
+
+
+def rank_customers(input_file: str, output_file: str, key: str, n: int,
+                   workers: Optional[int] = 1) -> int:
+    """Write the top n customers by `key` to `output_file`; returns how many."""
+    if input_file.endswith((".jsonl", ".ndjson")):
+        top = top_n_customers_jsonl(input_file, key, n, workers)
+    else:
+        with open(input_file, "r", encoding="utf-8") as f:
+            top = top_n_by(iter_customers(f, input_file), key, n)
+    with open(output_file, "w", encoding="utf-8") as f:
+        return write_customers(top, f)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(1)
+    key = sys.argv[1]
+    top_n = int(sys.argv[2])
+    input_file = sys.argv[3] if len(sys.argv) > 3 else "customers.json"
+    output_file = sys.argv[4] if len(sys.argv) > 4 else "top_customers.json"
+    workers = int(sys.argv[5]) if len(sys.argv) > 5 else None
+
+    written = rank_customers(input_file, output_file, key, top_n, workers)
+    print(f"Top {written} customers by {key} were written to {output_file}")
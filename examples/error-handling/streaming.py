@@ -0,0 +1,163 @@
+"""Streaming top-N export for large customer files.
+
+main.py loads the whole input with `json.load` just to keep the first N
+customers. The functions here read the input in small chunks instead:
+
+* `iter_customers_json` walks the `{"customers": [...]}` document and
+  decodes one customer at a time with `json.JSONDecoder.raw_decode`;
+* `iter_customers_jsonl` reads JSON Lines input (one customer per line);
+* `write_customers` writes `{"customers": [...]}` record by record, in the
+  same layout as `json.dump(..., indent=4)`.
+
+`stream_top_customers` combines them and stops reading after N records,
+so memory use stays constant whatever the size of the input.
+
+Usage: python streaming.py TOP_N [input_file] [output_file]
+"""
+
+import json
+import sys
+import textwrap
+from itertools import islice
+from typing import Iterable, Iterator, TextIO
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+NUMBER_CHARS = "0123456789.eE+-"
+
+
+class _ChunkedJSONReader:
+    """Decodes JSON values one by one from a text stream read in chunks."""
+
+    def __init__(self, f: TextIO, chunk_size: int = CHUNK_SIZE):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read another chunk; False at the end of the file."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # Drop what has been consumed so the buffer does not grow
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ("" at the end)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON input, found {found or 'end of file'!r}")
+        self._pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Probably cut off at the end of the buffer: read more and retry
+                if not self._fill():
+                    raise
+                continue
+            # A number cut off by the end of the buffer ("12" of "12.5") decodes
+            # fine, so make sure the value is followed by something else
+            if (end == len(self._buffer) or self._buffer[end] in NUMBER_CHARS) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_customers_json(f: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """Yield the items of the top-level "customers" array one at a time."""
+    reader = _ChunkedJSONReader(f, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "customers":
+            break
+        reader.value()  # skip other top-level values
+        if reader.peek() == "}":
+            return
+        reader.expect(",")
+
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value()
+        if reader.peek() == "]":
+            return
+        reader.expect(",")
+
+
+def iter_customers_jsonl(f: TextIO) -> Iterator[dict]:
+    """Yield one customer per non-empty line of JSON Lines input."""
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_customers(f: TextIO, input_file: str) -> Iterator[dict]:
+    """Pick the JSON Lines or JSON reader based on the file name."""
+    if input_file.endswith((".jsonl", ".ndjson")):
+        return iter_customers_jsonl(f)
+    return iter_customers_json(f)
+
+
+def write_customers(customers: Iterable[dict], f: TextIO) -> int:
+    """Write {"customers": [...]} like json.dump(indent=4), one record at a time.
+
+    Returns the number of customers written.
+    """
+    count = 0
+    f.write('{\n    "customers": [')
+    for customer in customers:
+        f.write(",\n" if count else "\n")
+        f.write(textwrap.indent(json.dumps(customer, indent=4), " " * 8))
+        count += 1
+    f.write("\n    ]\n}" if count else "]\n}")
+    return count
+
+
+def stream_top_customers(input_file: str, output_file: str, top_n: int) -> int:
+    """Copy the first `top_n` customers of `input_file` to `output_file`.
+
+    Stops reading the input after `top_n` records. Returns how many were
+    written (fewer if the input is shorter).
+    """
+    with open(input_file, "r", encoding="utf-8") as f_in, \
+            open(output_file, "w", encoding="utf-8") as f_out:
+        return write_customers(islice(iter_customers(f_in, input_file), top_n), f_out)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(1)
+    top_n = int(sys.argv[1])
+    input_file = sys.argv[2] if len(sys.argv) > 2 else "customers.json"
+    output_file = sys.argv[3] if len(sys.argv) > 3 else "top_customers.json"
+
+    written = stream_top_customers(input_file, output_file, top_n)
+    print(f"Top {written} customers were written to {output_file}")
@@ -0,0 +1,79 @@
+"""Microbenchmark: template-first DescriptionEngine vs. building all 12 templates.
+
+Usage: uv run bench_descriptions.py [n_calls]
+"""
+
+import random
+import sys
+import time
+from collections import Counter
+
+from faker import Faker
+
+from descriptions import DescriptionEngine
+
+fake = Faker()
+
+
+def legacy_generate_description() -> str:
+    """The original implementation: fill every template, keep one."""
+    templates = [
+        f"Market {fake.word()} adjustment",
+        f"{fake.company_suffix()} restructuring",
+        f"Volume {random.choice(['increase', 'decrease', 'shift'])}",
+        f"Price {random.choice(['optimization', 'correction', 'adjustment'])}",
+        f"{fake.word().capitalize()} cost variance",
+        f"FX {random.choice(['impact', 'effect', 'adjustment'])}",
+        f"Seasonal {random.choice(['effect', 'trend', 'pattern'])}",
+        f"Customer {random.choice(['mix change', 'churn', 'acquisition'])}",
+        f"Supply chain {random.choice(['delay', 'optimization', 'cost'])}",
+        f"Material cost {random.choice(['increase', 'savings', 'variance'])}",
+        f"Labor {random.choice(['efficiency', 'cost change', 'reallocation'])}",
+        f"Inventory {random.choice(['write-off', 'adjustment', 'revaluation'])}",
+    ]
+    return random.choice(templates)
+
+
+def template_of(description: str) -> str:
+    """Collapse a description to its template, e.g. 'Market * adjustment'."""
+    if description.startswith("Material cost "):
+        return description
+    if description.startswith("Market "):
+        return "Market *"
+    if description.endswith(" restructuring"):
+        return "* restructuring"
+    if description.endswith(" cost variance"):
+        return "* cost variance"
+    return description
+
+
+def run(generate, n: int):
+    """Call `generate` n times; return seconds taken and the template counts."""
+    counts = Counter()
+    start = time.perf_counter()
+    for _ in range(n):
+        counts[template_of(generate())] += 1
+    return time.perf_counter() - start, counts
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    random.seed(1)
+    fake.seed_instance(1)
+    engine = DescriptionEngine(seed=1)
+
+    legacy_time, legacy_counts = run(legacy_generate_description, n)
+    engine_time, engine_counts = run(engine.describe, n)
+
+    print(f"{n:,} descriptions")
+    print(f"  legacy: {legacy_time:.3f}s  ({legacy_time / n * 1e6:.1f}s per million)")
+    print(f"  engine: {engine_time:.3f}s  ({engine_time / n * 1e6:.1f}s per million)")
+    print(f"  speedup: {legacy_time / engine_time:.1f}x")
+
+    print(f"\n  {'text':<32} {'legacy':>8} {'engine':>8}")
+    for text in sorted(legacy_counts.keys() | engine_counts.keys()):
+        print(f"  {text:<32} {legacy_counts[text] / n:>8.2%} {engine_counts[text] / n:>8.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Compare the per-object generator with the vectorized bulk generator.
+
+Usage: uv run bench_generate.py [n_kpis ...]
+"""
+
+import random
+import sys
+import time
+
+from bulk_generator import check_invariants, generate_test_data_bulk
+from main import generate_test_data
+
+
+def time_call(func, *args, **kwargs) -> float:
+    """Return the wall time of one call in seconds."""
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    per_object_limit = 10_000  # the per-object path is too slow beyond this
+
+    print(f"{'KPIs':>10} {'per-object':>12} {'bulk':>10} {'speedup':>9}")
+    for n in sizes:
+        names = [f"KPI {i}" for i in range(n)]
+
+        bulk = time_call(generate_test_data_bulk, names, seed=1)
+        check_invariants(generate_test_data_bulk(names, seed=1))
+
+        if n <= per_object_limit:
+            random.seed(1)
+            per_object = time_call(generate_test_data, names)
+            print(f"{n:>10,} {per_object:>11.3f}s {bulk:>9.3f}s {per_object / bulk:>8.0f}x")
+        else:
+            print(f"{n:>10,} {'-':>12} {bulk:>9.3f}s {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
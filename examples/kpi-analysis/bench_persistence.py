@@ -0,0 +1,89 @@
+"""Load time and peak memory: binary mmap store vs. json and pickle.
+
+Each load runs in a fresh Python process so the peak RSS belongs to that
+format alone. "open" is the time until the data can be used; "scan" also
+touches every partition value once.
+
+Usage: uv run bench_persistence.py [n_kpis]
+"""
+
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+
+from bulk_generator import generate_test_data_bulk
+from persistence import export_json, import_json, load_store, save_store
+
+FORMATS = ("binary", "json", "pickle")
+
+
+def load_and_scan(fmt: str, path: str) -> None:
+    """Child process: load one file and print open time, scan time and peak RSS."""
+    start = time.perf_counter()
+    if fmt == "binary":
+        store = load_store(path)
+        opened = time.perf_counter()
+        total = float(store.partition_values.sum())
+    else:
+        if fmt == "json":
+            kpis = import_json(path)
+        else:
+            with open(path, "rb") as f:
+                kpis = pickle.load(f)
+        opened = time.perf_counter()
+        total = sum(p.value for kpi in kpis for delta in kpi.deltas for p in delta.partitions)
+    scanned = time.perf_counter()
+
+    print(f"{opened - start:.4f} {scanned - start:.4f} {peak_rss_mb():.1f} {total:.2f}")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in MB."""
+    # On Linux ru_maxrss survives exec(), so it would include the parent's
+    # peak; VmHWM in /proc belongs to this process image only.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1e3
+    except FileNotFoundError:
+        pass
+    import resource  # not available on Windows
+
+    # ru_maxrss is in bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    store = generate_test_data_bulk([f"KPI {i}" for i in range(n)], seed=1)
+    kpis = store.to_kpis()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {fmt: os.path.join(tmp, f"kpis.{fmt}") for fmt in FORMATS}
+        save_store(store, paths["binary"])
+        export_json(kpis, paths["json"])
+        with open(paths["pickle"], "wb") as f:
+            pickle.dump(kpis, f, protocol=pickle.HIGHEST_PROTOCOL)
+        del kpis
+
+        print(f"{n:,} KPIs, {len(store.partition_values):,} partitions")
+        print(f"  {'format':<8} {'size':>10} {'open':>9} {'scan':>9} {'peak RSS':>10}")
+        for fmt in FORMATS:
+            result = subprocess.run(
+                [sys.executable, __file__, "--load", fmt, paths[fmt]],
+                capture_output=True, text=True, check=True)
+            opened, scanned, peak_mb, _ = result.stdout.split()
+            size_mb = os.path.getsize(paths[fmt]) / 1e6
+            print(f"  {fmt:<8} {size_mb:>8.1f}MB {float(opened):>8.3f}s {float(scanned):>8.3f}s "
+                  f"{float(peak_mb):>8.1f}MB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--load":
+        load_and_scan(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,55 @@
+"""Throughput of the report renderers vs. the per-line print() path.
+
+Both write to a temporary file, like a report redirected to a file.
+
+Usage: uv run bench_report.py [n_kpis]
+"""
+
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+from bulk_generator import generate_test_data_bulk
+from main import print_test_data, print_test_data_top_n
+from report import render_csv, render_jsonl, render_text
+
+
+def measure(label: str, write) -> None:
+    """Run `write(file)` against a temporary file and print lines/sec."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.out")
+        with open(path, "w", encoding="utf-8") as f:
+            start = time.perf_counter()
+            write(f)
+            f.flush()
+            elapsed = time.perf_counter() - start
+        with open(path, encoding="utf-8") as f:
+            lines = sum(1 for _ in f)
+    print(f"  {label:<22} {lines:>10,} lines {elapsed:>8.3f}s {lines / elapsed:>14,.0f} lines/sec")
+
+
+def printed(print_func, *args):
+    """Wrap a print_* function so that it writes to the given file."""
+    def write(f):
+        with contextlib.redirect_stdout(f):
+            print_func(*args)
+    return write
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    kpis = generate_test_data_bulk([f"KPI {i}" for i in range(n)], seed=1).to_kpis()
+    print(f"{n:,} KPIs")
+
+    measure("print_test_data", printed(print_test_data, kpis))
+    measure("render_text", lambda f: render_text(kpis, f))
+    measure("print_test_data_top_n", printed(print_test_data_top_n, kpis, 2))
+    measure("render_text top_n", lambda f: render_text(kpis, f, top_n=2))
+    measure("render_csv", lambda f: render_csv(kpis, f))
+    measure("render_jsonl", lambda f: render_jsonl(kpis, f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Vectorized bulk generation of KPI test data.
+
+`generate_test_data_bulk` produces the same kind of data as
+`main.generate_test_data`, but draws every metric, partition count,
+proportion and description choice for all KPIs in one pass over a NumPy
+`Generator`, and returns a `KPIStore` instead of a graph of dataclasses.
+
+The invariants of the per-object path are kept:
+
+* metrics are uniform in [10, 150] with 2 decimal places,
+* the partitions of a delta sum exactly to the rounded delta total,
+* every partition has the sign of its delta (zero deltas get a single
+  "No variance" partition).
+
+All amounts are computed in integer cents, so the sums are exact; values
+are divided by 100 only when stored. The same seed always gives the same
+store.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from descriptions import TEMPLATES, DescriptionEngine
+from kpi_store import DELTA_NAMES, KPIStore
+
+NO_VARIANCE = "No variance"
+
+
+def _build_description_table(engine: DescriptionEngine, pool_size: int) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Expand every template into its possible texts.
+
+    Faker-filled templates get `pool_size` tokens from the engine's pools.
+    Returns the string table plus, per template, the code of its first text
+    and its number of texts.
+    """
+    table = [NO_VARIANCE]
+    starts = []
+    sizes = []
+    for prefix, suffix, options in TEMPLATES:
+        if isinstance(options, str):
+            options = engine.pools[options].take(pool_size)
+        starts.append(len(table))
+        sizes.append(len(options))
+        table.extend(f"{prefix}{option}{suffix}" for option in options)
+    return table, np.array(starts, dtype=np.int64), np.array(sizes, dtype=np.int64)
+
+
+def generate_test_data_bulk(
+    kpi_names: List[str] = None,
+    seed: Optional[int] = None,
+    min_val: float = 10.0,
+    max_val: float = 150.0,
+    min_partitions: int = 1,
+    max_partitions: int = 5,
+    word_pool_size: int = 256,
+) -> KPIStore:
+    """Generate test data for all KPIs at once and return it as a `KPIStore`."""
+    if kpi_names is None:
+        kpi_names = ["Q3", "Q3 SB", "Cupra"]
+
+    rng = np.random.default_rng(seed)
+    engine = DescriptionEngine(pool_size=word_pool_size, seed=seed)
+
+    n_kpis = len(kpi_names)
+    n_deltas = n_kpis * len(DELTA_NAMES)
+
+    # Metrics in cents: plan, forecast, fact
+    metric_cents = np.rint(rng.uniform(min_val, max_val, (n_kpis, 3)) * 100).astype(np.int64)
+    plan, forecast, fact = metric_cents.T
+    delta_cents = np.stack([plan - forecast, plan - fact, forecast - fact], axis=1).ravel()
+    abs_cents = np.abs(delta_cents)
+    signs = np.where(delta_cents >= 0, 1, -1)
+    has_variance = abs_cents > 0
+
+    # Partition layout: one partition for zero deltas, random count otherwise
+    counts = rng.integers(min_partitions, max_partitions + 1, n_deltas)
+    counts[~has_variance] = 1
+    offsets = np.zeros(n_deltas + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    starts = offsets[:-1]
+    lasts = offsets[1:] - 1
+    owner = np.repeat(np.arange(n_deltas), counts)
+
+    # Split each delta by random proportions. Flooring keeps the other
+    # partitions from overshooting, so the last one takes the (non-negative)
+    # remainder and the sum is exact.
+    proportions = rng.random(len(owner))
+    shares = proportions / np.add.reduceat(proportions, starts)[owner]
+    part_cents = np.floor(shares * abs_cents[owner]).astype(np.int64)
+    part_cents[lasts] = 0
+    part_cents[lasts] = abs_cents - np.add.reduceat(part_cents, starts)
+    partition_values = signs[owner] * part_cents / 100
+
+    # Descriptions: pick a template, then one of its texts
+    descriptions, template_starts, template_sizes = _build_description_table(engine, word_pool_size)
+    template = rng.integers(0, len(TEMPLATES), len(owner))
+    choice = (rng.random(len(owner)) * template_sizes[template]).astype(np.int64)
+    codes = (template_starts[template] + choice).astype(np.int32)
+    codes[~has_variance[owner]] = 0
+
+    return KPIStore(
+        kpi_names=list(kpi_names),
+        metrics=metric_cents / 100,
+        delta_totals=(delta_cents / 100).reshape(n_kpis, len(DELTA_NAMES)),
+        delta_offsets=offsets,
+        partition_values=partition_values,
+        partition_codes=codes,
+        descriptions=descriptions,
+    )
+
+
+def check_invariants(store: KPIStore) -> None:
+    """Raise `ValueError` if partitions do not add up to their delta or flip its sign."""
+    starts = store.delta_offsets[:-1]
+    totals = store.delta_totals.ravel()
+    sums = np.add.reduceat(store.partition_values, starts)
+    if not np.array_equal(np.round(sums, 2), np.round(totals, 2)):
+        raise ValueError("partitions do not sum to their delta total")
+
+    owner = np.repeat(np.arange(len(totals)), np.diff(store.delta_offsets))
+    if np.any(store.partition_values * totals[owner] < 0):
+        raise ValueError("a partition has the opposite sign of its delta")
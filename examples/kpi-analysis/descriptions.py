@@ -0,0 +1,103 @@
+"""Description engine for delta partitions.
+
+A description is one of 12 templates. Nine of them are filled with a fixed
+word list, three with a Faker token (a word, a capitalized word or a company
+suffix). The engine picks the template first and only fills that one, so a
+description costs one template choice plus at most one token.
+
+Faker tokens are not produced one call at a time: each kind is drawn from a
+`TokenPool`, a bounded list of pre-sampled tokens that is refilled in one
+batch when it runs out. Every token is still used exactly once, so the
+output follows the same distribution as calling Faker directly.
+"""
+
+import random
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from faker import Faker
+
+# (prefix, suffix, options); a string as options names the token pool to use.
+TEMPLATES: List[Tuple[str, str, Union[str, List[str]]]] = [
+    ("Market ", " adjustment", "word"),
+    ("", " restructuring", "company_suffix"),
+    ("Volume ", "", ["increase", "decrease", "shift"]),
+    ("Price ", "", ["optimization", "correction", "adjustment"]),
+    ("", " cost variance", "Word"),
+    ("FX ", "", ["impact", "effect", "adjustment"]),
+    ("Seasonal ", "", ["effect", "trend", "pattern"]),
+    ("Customer ", "", ["mix change", "churn", "acquisition"]),
+    ("Supply chain ", "", ["delay", "optimization", "cost"]),
+    ("Material cost ", "", ["increase", "savings", "variance"]),
+    ("Labor ", "", ["efficiency", "cost change", "reallocation"]),
+    ("Inventory ", "", ["write-off", "adjustment", "revaluation"]),
+]
+
+
+class TokenPool:
+    """A bounded pool of pre-sampled tokens that refills itself when empty."""
+
+    def __init__(self, sample: Callable[[int], List[str]], size: int = 1024):
+        if size < 1:
+            raise ValueError("pool size must be at least 1")
+        self.size = size
+        self._sample = sample
+        self._tokens: List[str] = []
+
+    def next(self) -> str:
+        """Return the next token, sampling a new batch if the pool is empty."""
+        if not self._tokens:
+            self._tokens = self._sample(self.size)
+            self._tokens.reverse()  # pop() from the end keeps sampling order
+        return self._tokens.pop()
+
+    def take(self, n: int) -> List[str]:
+        """Return the next `n` tokens."""
+        return [self.next() for _ in range(n)]
+
+    def clear(self) -> None:
+        """Drop the pre-sampled tokens; the next call samples a fresh batch."""
+        self._tokens = []
+
+
+class DescriptionEngine:
+    """Generates partition descriptions from `TEMPLATES`.
+
+    `rng` chooses templates and fixed words; by default it is the `random`
+    module, so `random.seed()` controls it as before. `fake` fills the token
+    pools; pass `seed` to get a private, reproducible `random.Random` and
+    Faker instead.
+    """
+
+    def __init__(
+        self,
+        fake: Optional[Faker] = None,
+        rng=random,
+        pool_size: int = 1024,
+        seed: Optional[int] = None,
+    ):
+        if fake is None:
+            fake = Faker()
+        if seed is not None:
+            fake.seed_instance(seed)
+            rng = random.Random(seed)
+        self._rng = rng
+        self.pools: Dict[str, TokenPool] = {
+            "word": TokenPool(lambda n: fake.words(nb=n), pool_size),
+            "Word": TokenPool(lambda n: [w.capitalize() for w in fake.words(nb=n)], pool_size),
+            "company_suffix": TokenPool(
+                lambda n: [fake.company_suffix() for _ in range(n)], pool_size),
+        }
+
+    def reset(self) -> None:
+        """Empty all token pools, e.g. after re-seeding Faker."""
+        for pool in self.pools.values():
+            pool.clear()
+
+    def describe(self) -> str:
+        """Return one random description."""
+        prefix, suffix, options = TEMPLATES[self._rng.randrange(len(TEMPLATES))]
+        if isinstance(options, str):
+            token = self.pools[options].next()
+        else:
+            token = self._rng.choice(options)
+        return f"{prefix}{token}{suffix}"
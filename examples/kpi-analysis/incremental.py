@@ -0,0 +1,112 @@
+"""Incremental delta recomputation when KPI metrics change.
+
+Each delta depends on two metric fields:
+
+    Plan vs Forecast   plan - forecast
+    Plan vs Fact       plan - fact
+    Forecast vs Fact   forecast - fact
+
+so updating `fact` only touches "Plan vs Fact" and "Forecast vs Fact".
+`KPIUpdater.update` changes the metrics of one KPI, recomputes just the
+affected deltas, rescales their existing partitions to the new total and
+emits a `DeltaChanged` event for every delta whose total actually changed.
+Subscribers (e.g. a report) can then refresh only those deltas.
+
+    updater = KPIUpdater(kpis)
+    updater.subscribe(lambda event: print(event.kpi_name, event.delta.name))
+    updater.update("Q3", fact=120.5)
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+from main import KPI, Delta, DeltaPartition, generate_partitions
+
+DELTA_FORMULAS: Dict[str, Tuple[str, str]] = {
+    "Plan vs Forecast": ("plan", "forecast"),
+    "Plan vs Fact": ("plan", "fact"),
+    "Forecast vs Fact": ("forecast", "fact"),
+}
+
+# metric field -> names of the deltas that use it
+DELTA_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    field: tuple(name for name, fields in DELTA_FORMULAS.items() if field in fields)
+    for field in ("plan", "forecast", "fact")
+}
+
+
+@dataclass
+class DeltaChanged:
+    """Event emitted when a delta of a KPI was recomputed."""
+    kpi_name: str
+    delta: Delta
+    old_total: float
+
+
+def rescale_partitions(partitions: List[DeltaPartition], old_total: float,
+                       new_total: float) -> List[DeltaPartition]:
+    """Scale partitions from `old_total` to `new_total`, keeping their descriptions.
+
+    The partitions keep their relative sizes, take the sign of the new
+    total and sum to it exactly. A delta that was or becomes zero gets
+    freshly generated partitions instead.
+    """
+    if abs(old_total) < 0.01 or abs(new_total) < 0.01:
+        return generate_partitions(new_total)
+
+    # Work in integer cents; flooring all but the last partition means the
+    # last one takes a non-negative remainder.
+    new_cents = round(abs(new_total) * 100)
+    cents = [math.floor(abs(p.value) / abs(old_total) * new_cents) for p in partitions[:-1]]
+    cents.append(new_cents - sum(cents))
+    sign = 1 if new_total >= 0 else -1
+    return [DeltaPartition(value=round(sign * c / 100, 2), description=p.description)
+            for c, p in zip(cents, partitions)]
+
+
+class KPIUpdater:
+    """Applies metric updates to KPIs and recomputes only the affected deltas."""
+
+    def __init__(self, kpis: List[KPI]):
+        self._kpis: Dict[str, KPI] = {kpi.name: kpi for kpi in kpis}
+        self._subscribers: List[Callable[[DeltaChanged], None]] = []
+
+    def subscribe(self, callback: Callable[[DeltaChanged], None]) -> None:
+        """Call `callback` with every `DeltaChanged` event from now on."""
+        self._subscribers.append(callback)
+
+    def update(self, kpi_name: str, **fields: float) -> List[DeltaChanged]:
+        """Set metric fields (plan, forecast, fact) of a KPI.
+
+        Returns the emitted events, one per delta whose total changed.
+        """
+        kpi = self._kpis.get(kpi_name)
+        if kpi is None:
+            raise KeyError(f"Unknown KPI: {kpi_name}")
+        unknown = fields.keys() - DELTA_DEPENDENCIES.keys()
+        if unknown:
+            raise ValueError(f"Unknown metric field(s): {', '.join(sorted(unknown))}")
+
+        affected = set()
+        for field, value in fields.items():
+            setattr(kpi.metrics, field, round(value, 2))
+            affected.update(DELTA_DEPENDENCIES[field])
+
+        events = []
+        for delta in kpi.deltas:
+            if delta.name not in affected:
+                continue
+            minuend, subtrahend = DELTA_FORMULAS[delta.name]
+            new_total = round(getattr(kpi.metrics, minuend) - getattr(kpi.metrics, subtrahend), 2)
+            if new_total == delta.total_value:
+                continue
+            old_total = delta.total_value
+            delta.partitions = rescale_partitions(delta.partitions, old_total, new_total)
+            delta.total_value = new_total
+            events.append(DeltaChanged(kpi_name=kpi.name, delta=delta, old_total=old_total))
+
+        for event in events:
+            for callback in self._subscribers:
+                callback(event)
+        return events
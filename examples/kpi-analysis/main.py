@@ -1,9 +1,13 @@
 from dataclasses import dataclass, field
 from faker import Faker
+import heapq
 import random
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Union
+
+from descriptions import DescriptionEngine
 
 fake = Faker()
+_descriptions = DescriptionEngine(fake)
 
 
 @dataclass
@@ -37,6 +41,22 @@ class KPI:
     deltas: List[Delta] = field(default_factory=list)
 
 
+@dataclass
+class TopPartitions:
+    """The top N partitions of a delta plus the remainder folded into "Misc."."""
+    top: List[DeltaPartition]
+    misc_count: int
+    misc_sum: float
+    top_sum: float
+
+
+def seed_test_data(seed: int) -> None:
+    """Seed every random source used by generate_test_data, for reproducible output."""
+    random.seed(seed)
+    fake.seed_instance(seed)
+    _descriptions.reset()
+
+
 def generate_random_value(min_val: float = 10.0, max_val: float = 150.0) -> float:
     """Generate a random float with 2 decimal places."""
     return round(random.uniform(min_val, max_val), 2)
@@ -44,21 +64,7 @@ def generate_random_value(min_val: float = 10.0, max_val: float = 150.0) -> floa
 
 def generate_description() -> str:
     """Generate a short business-like description for a delta partition."""
-    templates = [
-        f"Market {fake.word()} adjustment",
-        f"{fake.company_suffix()} restructuring",
-        f"Volume {random.choice(['increase', 'decrease', 'shift'])}",
-        f"Price {random.choice(['optimization', 'correction', 'adjustment'])}",
-        f"{fake.word().capitalize()} cost variance",
-        f"FX {random.choice(['impact', 'effect', 'adjustment'])}",
-        f"Seasonal {random.choice(['effect', 'trend', 'pattern'])}",
-        f"Customer {random.choice(['mix change', 'churn', 'acquisition'])}",
-        f"Supply chain {random.choice(['delay', 'optimization', 'cost'])}",
-        f"Material cost {random.choice(['increase', 'savings', 'variance'])}",
-        f"Labor {random.choice(['efficiency', 'cost change', 'reallocation'])}",
-        f"Inventory {random.choice(['write-off', 'adjustment', 'revaluation'])}",
-    ]
-    return random.choice(templates)
+    return _descriptions.describe()
 
 
 def generate_partitions(total_delta: float, min_partitions: int = 1, max_partitions: int = 5) -> List[DeltaPartition]:
@@ -131,63 +137,104 @@ def generate_test_data(kpi_names: List[str] = None) -> List[KPI]:
     return [generate_kpi(name) for name in kpi_names]
 
 
-def _print_kpi_header(kpi: KPI) -> None:
-    """Print the KPI banner with Plan, Forecast, and Fact values."""
-    print(f"\n{'='*60}")
-    print(f"KPI: {kpi.name}")
-    print(f"{'='*60}")
-    print(f"  Plan:     {kpi.metrics.plan:>8.2f}")
-    print(f"  Forecast: {kpi.metrics.forecast:>8.2f}")
-    print(f"  Fact:     {kpi.metrics.fact:>8.2f}")
+def top_n_partitions(delta: Union[Delta, Iterable[DeltaPartition]], n: int) -> TopPartitions:
+    """Rank partitions by abs(value) in one O(len * log n) pass.
+
+    Accepts a Delta or any iterable of partitions, so partitions can be
+    streamed without building a list. Ties keep their original order, as
+    with a stable sort.
+    """
+    partitions = getattr(delta, "partitions", delta)
+
+    # Min-heap of (abs value, -position, partition): the root is the weakest
+    # of the current top N, and on ties the later partition is weaker.
+    heap = []
+    misc_count = 0
+    misc_sum = 0.0
+    for position, partition in enumerate(partitions):
+        item = (abs(partition.value), -position, partition)
+        if len(heap) < n:
+            heapq.heappush(heap, item)
+            continue
+        if heap and item[:2] > heap[0][:2]:
+            item = heapq.heapreplace(heap, item)
+        misc_count += 1
+        misc_sum += item[2].value
+
+    top = [partition for _, _, partition in sorted(heap, key=lambda i: i[:2], reverse=True)]
+    return TopPartitions(
+        top=top,
+        misc_count=misc_count,
+        misc_sum=round(misc_sum, 2),
+        top_sum=sum(p.value for p in top),
+    )
 
 
-def _print_delta_header(delta: Delta) -> None:
-    """Print a delta's name and total value."""
-    print(f"\n  {delta.name}: {delta.total_value:+.2f}")
+def _kpi_header_lines(kpi: KPI) -> Iterator[str]:
+    """Yield the KPI banner with Plan, Forecast, and Fact values."""
+    yield f"\n{'='*60}"
+    yield f"KPI: {kpi.name}"
+    yield f"{'='*60}"
+    yield f"  Plan:     {kpi.metrics.plan:>8.2f}"
+    yield f"  Forecast: {kpi.metrics.forecast:>8.2f}"
+    yield f"  Fact:     {kpi.metrics.fact:>8.2f}"
 
 
-def print_test_data_top_n(kpis: List[KPI], top_n: int) -> None:
-    """Pretty print the generated test data, showing only the top N partitions by abs(value) per delta."""
+def _delta_header_line(delta: Delta) -> str:
+    """Return a delta's name and total value."""
+    return f"\n  {delta.name}: {delta.total_value:+.2f}"
+
+
+def _top_n_partition_lines(delta: Delta, top_n: int) -> Iterator[str]:
+    """Yield the top N partitions of a delta, the Misc. line and the sum."""
+    ranking = top_n_partitions(delta, top_n)
+    actual_top = len(ranking.top)
+    yield f"  Top {actual_top} Partition{'s' if actual_top != 1 else ''}:"
+    for i, partition in enumerate(ranking.top, 1):
+        yield f"    {i}. {partition.value:+7.2f} : {partition.description}"
+    if ranking.misc_count:
+        yield f"    {actual_top + 1}. {ranking.misc_sum:+7.2f} : Misc."
+    yield f"    {'─'*40}"
+    yield f"    Sum (top {actual_top}): {ranking.top_sum:+7.2f} (Total: {delta.total_value:+.2f})"
+
+
+def _partition_lines(delta: Delta) -> Iterator[str]:
+    """Yield every partition of a delta and the sum."""
+    yield "  Partitions:"
+    for i, partition in enumerate(delta.partitions, 1):
+        yield f"    {i}. {partition.value:+7.2f} : {partition.description}"
+    partition_sum = sum(p.value for p in delta.partitions)
+    yield f"    {'─'*40}"
+    yield f"    Sum: {partition_sum:+7.2f} (Total: {delta.total_value:+.2f})"
+
+
+def report_lines(kpis: Iterable[KPI], top_n: Optional[int] = None) -> Iterator[str]:
+    """Yield the lines of the test data report, without trailing newlines.
+
+    With `top_n` only the top N partitions by abs(value) are listed per delta.
+    `kpis` may be a generator; one KPI is formatted at a time.
+    """
     for kpi in kpis:
-        _print_kpi_header(kpi)
+        yield from _kpi_header_lines(kpi)
 
         for delta in kpi.deltas:
-            _print_delta_header(delta)
-            sorted_partitions = sorted(
-                delta.partitions, key=lambda p: abs(p.value), reverse=True
-            )
-            top_partitions = sorted_partitions[:top_n]
-            remaining_partitions = sorted_partitions[top_n:]
-            actual_top = len(top_partitions)
-            print(
-                f"  Top {actual_top} Partition{'s' if actual_top != 1 else ''}:")
-            for i, partition in enumerate(top_partitions, 1):
-                print(
-                    f"    {i}. {partition.value:+7.2f} : {partition.description}")
-            if remaining_partitions:
-                misc_sum = round(sum(p.value for p in remaining_partitions), 2)
-                print(f"    {actual_top + 1}. {misc_sum:+7.2f} : Misc.")
-            partition_sum = sum(p.value for p in top_partitions)
-            print(f"    {'─'*40}")
-            print(
-                f"    Sum (top {actual_top}): {partition_sum:+7.2f} (Total: {delta.total_value:+.2f})")
+            yield _delta_header_line(delta)
+            if top_n is None:
+                yield from _partition_lines(delta)
+            else:
+                yield from _top_n_partition_lines(delta, top_n)
+
+
+def print_test_data_top_n(kpis: List[KPI], top_n: int) -> None:
+    """Pretty print the generated test data, showing only the top N partitions by abs(value) per delta."""
+    for line in report_lines(kpis, top_n):
+        print(line)
 
 
 def print_test_data(kpis: List[KPI]) -> None:
     """Pretty print the generated test data."""
-    for kpi in kpis:
-        _print_kpi_header(kpi)
-
-        for delta in kpi.deltas:
-            _print_delta_header(delta)
-            print(f"  Partitions:")
-            for i, partition in enumerate(delta.partitions, 1):
-                print(
-                    f"    {i}. {partition.value:+7.2f} : {partition.description}")
-            partition_sum = sum(p.value for p in delta.partitions)
-            print(f"    {'─'*40}")
-            print(
-                f"    Sum: {partition_sum:+7.2f} (Total: {delta.total_value:+.2f})")
+    for line in report_lines(kpis):
+        print(line)
 
 
 # Example usage
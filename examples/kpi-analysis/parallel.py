@@ -0,0 +1,80 @@
+"""Generate KPI test data on several cores.
+
+`generate_test_data_parallel` splits `kpi_names` into fixed-size shards and
+runs `generate_test_data` for each shard in a `ProcessPoolExecutor`. Every
+shard gets its own seed, derived from the base seed and the shard number
+with `numpy.random.SeedSequence`, and the worker re-seeds all random
+sources (see `seed_test_data`) before generating it.
+
+Because the seed depends on the shard and not on the worker that happens to
+run it, the merged result is the same for any number of workers. Shards
+come back in order, so KPIs can be consumed while later shards are still
+being generated.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from main import KPI, generate_test_data, seed_test_data
+
+
+def shard_seed(seed: int, shard_index: int) -> int:
+    """Derive an independent 32-bit seed for one shard."""
+    sequence = np.random.SeedSequence(entropy=seed, spawn_key=(shard_index,))
+    return int(sequence.generate_state(1)[0])
+
+
+def _generate_shard(shard: Tuple[List[str], int]) -> List[KPI]:
+    """Worker: generate one shard with its own seed."""
+    names, seed = shard
+    seed_test_data(seed)
+    return generate_test_data(names)
+
+
+def generate_test_data_parallel(
+    kpi_names: List[str],
+    seed: int = 0,
+    workers: Optional[int] = None,
+    shard_size: int = 1000,
+) -> Iterator[KPI]:
+    """Yield generated KPIs in the order of `kpi_names`, using a process pool.
+
+    `workers` defaults to the number of CPUs; with `workers=1` the shards
+    are generated in this process (re-seeding its global random state).
+    """
+    if shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+
+    shards = [
+        (kpi_names[start:start + shard_size], shard_seed(seed, index))
+        for index, start in enumerate(range(0, len(kpi_names), shard_size))
+    ]
+
+    if workers == 1:
+        for shard in shards:
+            yield from _generate_shard(shard)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for kpis in executor.map(_generate_shard, shards):
+            yield from kpis
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    names = [f"KPI {i}" for i in range(n)]
+
+    reference = None
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        kpis = list(generate_test_data_parallel(names, seed=1, workers=workers))
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = kpis
+        same = "same" if kpis == reference else "DIFFERENT"
+        print(f"{workers:>3} worker(s): {elapsed:7.2f}s  ({same} result)")
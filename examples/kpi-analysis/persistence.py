@@ -0,0 +1,249 @@
+"""Saving and loading KPI datasets.
+
+The binary format stores a `KPIStore` as fixed-width little-endian columns
+followed by two string tables, every section aligned to 8 bytes:
+
+    magic                 8 bytes   b"KPISTOR1"
+    header                6 x u64   n_kpis, n_partitions, n_descriptions,
+                                    names_bytes, descriptions_bytes, 0
+    metrics               f64 x n_kpis * 3
+    delta_totals          f64 x n_kpis * 3
+    delta_offsets         i64 x n_kpis * 3 + 1
+    partition_values      f64 x n_partitions
+    partition_codes       i32 x n_partitions
+    name_offsets          i64 x n_kpis + 1
+    description_offsets   i64 x n_descriptions + 1
+    names                 UTF-8, concatenated
+    descriptions          UTF-8, concatenated
+
+`load_store` maps the file with `mmap` and wraps every column in a NumPy
+array that points into the mapping, and strings are decoded only when
+accessed. Opening a multi-GB file is therefore instant; the operating
+system pages data in as it is read. The returned `MappedStore` keeps the
+file mapped until `close()` is called (or its `with` block ends).
+
+`save_store` writes to a temporary file next to `path` and renames it into
+place, so a store can be saved over the file it was loaded from.
+
+`export_json` / `import_json` and `export_csv` / `import_csv` convert
+`List[KPI]` to and from text formats.
+"""
+
+import csv
+import json
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from dataclasses import asdict
+from typing import BinaryIO, Iterable, List, Tuple, Union
+
+import numpy as np
+
+from kpi_store import DELTA_NAMES, KPIStore
+from main import KPI, Delta, DeltaPartition, KPIMetrics
+from report import CSV_HEADER, render_csv
+
+MAGIC = b"KPISTOR1"
+HEADER = struct.Struct("<6Q")
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % 8)
+
+
+def _write_section(f: BinaryIO, data: bytes) -> None:
+    """Write data followed by padding up to the next 8-byte boundary."""
+    f.write(data)
+    f.write(_padding(len(data)))
+
+
+def _string_table(strings: Iterable[str]) -> Tuple[np.ndarray, bytes]:
+    """Encode strings as (offsets array, concatenated UTF-8 bytes)."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return offsets, b"".join(encoded)
+
+
+class LazyStrings(Sequence):
+    """A read-only string table that decodes entries from a buffer on access."""
+
+    def __init__(self, buffer, offsets: np.ndarray, start: int):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._start = start
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("string table index out of range")
+        begin = self._start + int(self._offsets[i])
+        end = self._start + int(self._offsets[i + 1])
+        return bytes(self._buffer[begin:end]).decode("utf-8")
+
+
+class MappedStore(KPIStore):
+    """A `KPIStore` whose columns point into a memory-mapped file."""
+
+    def __init__(self, buffer: mmap.mmap, **columns):
+        super().__init__(**columns)
+        self._buffer = buffer
+
+    def close(self) -> None:
+        """Unmap the file; the store is empty afterwards.
+
+        Arrays taken from the store must be released first, otherwise the
+        mapping is still in use and `BufferError` is raised.
+        """
+        if self._buffer.closed:
+            return
+        self.kpi_names = []
+        self.metrics = np.empty((0, 3))
+        self.delta_totals = np.empty((0, len(DELTA_NAMES)))
+        self.delta_offsets = np.zeros(1, dtype=np.int64)
+        self.partition_values = np.empty(0)
+        self.partition_codes = np.empty(0, dtype=np.int32)
+        self.descriptions = []
+        self._buffer.close()
+
+    def __enter__(self) -> "MappedStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def save_store(data: Union[KPIStore, List[KPI]], path: str) -> None:
+    """Write a store (or list of KPIs) to `path` in the binary format."""
+    store = data if isinstance(data, KPIStore) else KPIStore.from_kpis(data)
+    name_offsets, names = _string_table(store.kpi_names)
+    description_offsets, descriptions = _string_table(store.descriptions)
+
+    columns = [
+        np.asarray(store.metrics, dtype="<f8"),
+        np.asarray(store.delta_totals, dtype="<f8"),
+        np.asarray(store.delta_offsets, dtype="<i8"),
+        np.asarray(store.partition_values, dtype="<f8"),
+        np.asarray(store.partition_codes, dtype="<i4"),
+        name_offsets,
+        description_offsets,
+    ]
+
+    # `store` may be mapped from `path` itself: truncating that file would
+    # pull the pages out from under the mapping, so write a new one
+    temporary = path + ".tmp"
+    try:
+        with open(temporary, "wb") as f:
+            f.write(MAGIC)
+            f.write(HEADER.pack(len(store.kpi_names), len(store.partition_values),
+                                len(store.descriptions), len(names), len(descriptions), 0))
+            for column in columns:
+                _write_section(f, np.ascontiguousarray(column).tobytes())
+            _write_section(f, names)
+            _write_section(f, descriptions)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def load_store(path: str) -> MappedStore:
+    """Open a binary KPI file with mmap; columns are paged in lazily."""
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if buffer[:len(MAGIC)] != MAGIC:
+        buffer.close()
+        raise ValueError(f"{path} is not a KPI store file")
+    n_kpis, n_partitions, n_descriptions, names_bytes, _, _ = HEADER.unpack_from(buffer, len(MAGIC))
+    n_deltas = n_kpis * len(DELTA_NAMES)
+    position = len(MAGIC) + HEADER.size
+
+    def column(dtype: str, count: int) -> np.ndarray:
+        nonlocal position
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=position)
+        position += array.nbytes + len(_padding(array.nbytes))
+        return array
+
+    metrics = column("<f8", n_kpis * 3).reshape(n_kpis, 3)
+    delta_totals = column("<f8", n_deltas).reshape(n_kpis, len(DELTA_NAMES))
+    delta_offsets = column("<i8", n_deltas + 1)
+    partition_values = column("<f8", n_partitions)
+    partition_codes = column("<i4", n_partitions)
+    name_offsets = column("<i8", n_kpis + 1)
+    description_offsets = column("<i8", n_descriptions + 1)
+    names_start = position
+    descriptions_start = names_start + names_bytes + len(_padding(names_bytes))
+
+    return MappedStore(
+        buffer,
+        kpi_names=LazyStrings(buffer, name_offsets, names_start),
+        metrics=metrics,
+        delta_totals=delta_totals,
+        delta_offsets=delta_offsets,
+        partition_values=partition_values,
+        partition_codes=partition_codes,
+        descriptions=LazyStrings(buffer, description_offsets, descriptions_start),
+    )
+
+
+def export_json(kpis: List[KPI], path: str) -> None:
+    """Write KPIs to a JSON file as {"kpis": [...]}."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"kpis": [asdict(kpi) for kpi in kpis]}, f, ensure_ascii=False)
+
+
+def import_json(path: str) -> List[KPI]:
+    """Read KPIs written by `export_json`."""
+    with open(path, encoding="utf-8") as f:
+        root = json.load(f)
+    return [
+        KPI(
+            name=item["name"],
+            metrics=KPIMetrics(**item["metrics"]),
+            deltas=[
+                Delta(name=delta["name"], total_value=delta["total_value"],
+                      partitions=[DeltaPartition(**p) for p in delta["partitions"]])
+                for delta in item["deltas"]
+            ],
+        )
+        for item in root.get("kpis", [])
+    ]
+
+
+def export_csv(kpis: List[KPI], path: str) -> None:
+    """Write one CSV row per partition (see `report.render_csv`)."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        render_csv(kpis, f)
+
+
+def import_csv(path: str) -> List[KPI]:
+    """Read KPIs written by `export_csv`.
+
+    Rows are grouped by consecutive KPI and delta names. Deltas without
+    partitions have no rows, so they are not restored.
+    """
+    kpis: List[KPI] = []
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames != CSV_HEADER:
+            raise ValueError(f"{path} does not have the KPI CSV header")
+        for row in reader:
+            if not kpis or kpis[-1].name != row["kpi"]:
+                metrics = KPIMetrics(plan=float(row["plan"]), forecast=float(row["forecast"]),
+                                     fact=float(row["fact"]))
+                kpis.append(KPI(name=row["kpi"], metrics=metrics))
+            deltas = kpis[-1].deltas
+            if not deltas or deltas[-1].name != row["delta"]:
+                deltas.append(Delta(name=row["delta"], total_value=float(row["delta_total"])))
+            deltas[-1].partitions.append(
+                DeltaPartition(value=float(row["value"]), description=row["description"]))
+    return kpis
@@ -0,0 +1,139 @@
+"""Group-by queries over KPI partitions.
+
+Every partition description comes from one of the templates in
+descriptions.py, so it belongs to a category such as "FX", "Labor" or
+"Supply chain". `PartitionIndex` categorizes each distinct description
+once, then builds, in one pass over the partitions:
+
+* an inverted index from (category, delta name) to partition positions,
+* per (category, delta name) sums and counts.
+
+Rollups (sum / count / mean) and top-k queries are answered from those
+small tables, so repeated queries never rescan the partitions; the
+positions are there for drilling down into the matching partitions.
+
+    index = PartitionIndex(kpis)                 # List[KPI] or KPIStore
+    index.rollup("sum")                          # {"FX": -123.4, ...}
+    index.top_categories(3, delta_name="Plan vs Fact")
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from bulk_generator import NO_VARIANCE
+from descriptions import TEMPLATES
+from kpi_store import DELTA_NAMES, KPIStore
+from main import KPI
+
+OTHER = "Other"
+AGGREGATES = ("sum", "count", "mean")
+
+
+def _category_name(prefix: str, suffix: str) -> str:
+    """Name a template after its fixed text, e.g. 'Supply chain' or 'Restructuring'."""
+    return prefix.strip() or suffix.strip().capitalize()
+
+
+CATEGORIES: List[str] = [_category_name(prefix, suffix) for prefix, suffix, _ in TEMPLATES]
+CATEGORIES += [NO_VARIANCE, OTHER]
+
+
+def categorize(description: str) -> str:
+    """Return the category of a partition description."""
+    if description == NO_VARIANCE:
+        return NO_VARIANCE
+    # Fixed texts first, so "Material cost variance" is not taken for "* cost variance"
+    for prefix, suffix, options in TEMPLATES:
+        if not isinstance(options, str) and description in {f"{prefix}{o}{suffix}" for o in options}:
+            return _category_name(prefix, suffix)
+    for prefix, suffix, options in TEMPLATES:
+        if isinstance(options, str) and description.startswith(prefix) and description.endswith(suffix):
+            return _category_name(prefix, suffix)
+    return OTHER
+
+
+class PartitionIndex:
+    """Inverted index and precomputed aggregates by category and delta."""
+
+    def __init__(self, data: Union[KPIStore, List[KPI]]):
+        store = data if isinstance(data, KPIStore) else KPIStore.from_kpis(data)
+        self.store = store
+        self.categories = CATEGORIES
+        n_deltas = len(DELTA_NAMES)
+        category_id = {name: i for i, name in enumerate(self.categories)}
+
+        # Category of every partition, via its description code
+        category_of_code = np.array(
+            [category_id[categorize(text)] for text in store.descriptions], dtype=np.int64)
+        partition_category = category_of_code[store.partition_codes]
+        partition_delta = np.repeat(
+            np.arange(len(store.delta_offsets) - 1) % n_deltas, np.diff(store.delta_offsets))
+        keys = partition_category * n_deltas + partition_delta
+
+        # Positions sorted by key; a category's three deltas are adjacent
+        n_keys = len(self.categories) * n_deltas
+        self._order = np.argsort(keys, kind="stable")
+        self._bounds = np.zeros(n_keys + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=n_keys), out=self._bounds[1:])
+
+        shape = (len(self.categories), n_deltas)
+        self._sums = np.bincount(keys, weights=store.partition_values, minlength=n_keys).reshape(shape)
+        self._counts = np.diff(self._bounds).reshape(shape)
+        self._cache: Dict[Tuple[str, Optional[str]], Dict[str, float]] = {}
+
+    def _delta_column(self, delta_name: Optional[str]) -> Optional[int]:
+        if delta_name is None:
+            return None
+        if delta_name not in DELTA_NAMES:
+            raise ValueError(f"Unknown delta: {delta_name}")
+        return DELTA_NAMES.index(delta_name)
+
+    def positions(self, category: str, delta_name: Optional[str] = None) -> np.ndarray:
+        """Positions (into the store's partition arrays) of a category's partitions."""
+        c = self.categories.index(category)
+        n_deltas = len(DELTA_NAMES)
+        d = self._delta_column(delta_name)
+        if d is None:
+            start, stop = c * n_deltas, (c + 1) * n_deltas
+        else:
+            start, stop = c * n_deltas + d, c * n_deltas + d + 1
+        return self._order[self._bounds[start]:self._bounds[stop]]
+
+    def rollup(self, agg: str = "sum", delta_name: Optional[str] = None) -> Dict[str, float]:
+        """Aggregate partition values per category, optionally for one delta.
+
+        Categories without partitions are left out.
+        """
+        if agg not in AGGREGATES:
+            raise ValueError(f"agg must be one of {', '.join(AGGREGATES)}")
+        cached = self._cache.get((agg, delta_name))
+        if cached is not None:
+            return cached
+
+        d = self._delta_column(delta_name)
+        sums = self._sums.sum(axis=1) if d is None else self._sums[:, d]
+        counts = self._counts.sum(axis=1) if d is None else self._counts[:, d]
+
+        result = {}
+        for name, total, count in zip(self.categories, sums.tolist(), counts.tolist()):
+            if count == 0:
+                continue
+            if agg == "sum":
+                result[name] = round(total, 2)
+            elif agg == "count":
+                result[name] = count
+            else:
+                result[name] = round(total / count, 2)
+        self._cache[(agg, delta_name)] = result
+        return result
+
+    def top_categories(self, k: int = 3, agg: str = "sum",
+                       delta_name: Optional[str] = None) -> List[Tuple[str, float]]:
+        """The k categories with the largest absolute aggregate."""
+        rollup = self.rollup(agg, delta_name)
+        return sorted(rollup.items(), key=lambda item: abs(item[1]), reverse=True)[:k]
+
+    def top_categories_per_delta(self, k: int = 3, agg: str = "sum") -> Dict[str, List[Tuple[str, float]]]:
+        """`top_categories` for every delta name."""
+        return {name: self.top_categories(k, agg, name) for name in DELTA_NAMES}
@@ -0,0 +1,123 @@
+"""Streaming report renderers for KPI test data.
+
+The `print_test_data*` functions in main.py call `print()` once per line.
+The renderers here write the same report (or a CSV / JSON Lines export) to
+any text stream through `BufferedLineWriter`, which collects lines and
+hands them to the stream in large blocks. They accept any iterable of KPIs,
+including generators and a `KPIStore`, and format one KPI at a time, so the
+report size does not limit memory.
+
+    with open("report.txt", "w", encoding="utf-8") as f:
+        render_text(kpis, f, top_n=2)
+"""
+
+import csv
+import json
+from typing import Iterable, List, Optional, TextIO
+
+from main import KPI, report_lines
+
+DEFAULT_BUFFER_SIZE = 1 << 20  # characters collected before each write
+
+CSV_HEADER = ["kpi", "plan", "forecast", "fact", "delta", "delta_total",
+              "partition", "value", "description"]
+
+
+class BufferedLineWriter:
+    """Collects text in memory and writes it to `out` in large blocks."""
+
+    def __init__(self, out: TextIO, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.out = out
+        self.buffer_size = buffer_size
+        self.lines_written = 0
+        self._chunks: List[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        """Buffer raw text (lets the writer stand in for a file, e.g. for `csv`)."""
+        self._chunks.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def write_line(self, line: str) -> None:
+        """Buffer one line; the newline is added here.
+
+        `line` may itself hold newlines (report headers start with one), so
+        every line it ends up as is counted.
+        """
+        self.lines_written += line.count("\n") + 1
+        self.write(line + "\n")
+
+    def flush(self) -> None:
+        """Write everything buffered so far to `out`."""
+        if self._chunks:
+            self.out.write("".join(self._chunks))
+            self._chunks.clear()
+            self._size = 0
+
+    def __enter__(self) -> "BufferedLineWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush()
+
+
+def render_text(kpis: Iterable[KPI], out: TextIO, top_n: Optional[int] = None,
+                buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
+    """Write the plain text report, identical to `print_test_data(_top_n)`.
+
+    Returns the number of lines written.
+    """
+    with BufferedLineWriter(out, buffer_size) as writer:
+        for line in report_lines(kpis, top_n):
+            writer.write_line(line)
+    return writer.lines_written
+
+
+def render_csv(kpis: Iterable[KPI], out: TextIO,
+               buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
+    """Write one CSV row per partition, with a header row.
+
+    Returns the number of lines written, header included.
+    """
+    with BufferedLineWriter(out, buffer_size) as writer:
+        rows = csv.writer(writer, lineterminator="\n")
+        rows.writerow(CSV_HEADER)
+        count = 1
+        for kpi in kpis:
+            metrics = kpi.metrics
+            for delta in kpi.deltas:
+                for i, partition in enumerate(delta.partitions, 1):
+                    rows.writerow([kpi.name, f"{metrics.plan:.2f}", f"{metrics.forecast:.2f}",
+                                   f"{metrics.fact:.2f}", delta.name, f"{delta.total_value:.2f}",
+                                   i, f"{partition.value:.2f}", partition.description])
+                    count += 1
+    return count
+
+
+def render_jsonl(kpis: Iterable[KPI], out: TextIO,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
+    """Write one JSON object per KPI, one per line (JSON Lines).
+
+    Returns the number of lines written.
+    """
+    with BufferedLineWriter(out, buffer_size) as writer:
+        for kpi in kpis:
+            record = {
+                "name": kpi.name,
+                "plan": kpi.metrics.plan,
+                "forecast": kpi.metrics.forecast,
+                "fact": kpi.metrics.fact,
+                "deltas": [
+                    {
+                        "name": delta.name,
+                        "total_value": delta.total_value,
+                        "partitions": [{"value": p.value, "description": p.description}
+                                       for p in delta.partitions],
+                    }
+                    for delta in kpi.deltas
+                ],
+            }
+            writer.write_line(json.dumps(record, ensure_ascii=False))
+    return writer.lines_written
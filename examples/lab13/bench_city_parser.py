@@ -0,0 +1,90 @@
+"""Benchmark city parsing: line.split(",") vs city_parser.parse_city_file.
+
+Writes a synthetic city file (some quoted names with commas, populations
+written like "1.7 million" or "689,545") and parses it
+  - naively: for each line, split(",") and convert the fields into a tuple
+  - with parse_city_file into typed columns
+and prints records/sec, MB/s, the memory the result keeps and how many
+records the naive split got wrong.
+
+Usage: python bench_city_parser.py [n_records]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from city_parser import parse_city_file, parse_population
+
+COUNTRIES = ["Hungary", "Austria", "Germany", "France", "Italy", "Spain", "USA", "Japan"]
+
+
+def write_synthetic(path, n):
+    rng = random.Random(42)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for i in range(n):
+            city = f"City {i}"
+            if rng.random() < 0.02:
+                city = f'"City {i}, Downtown"'
+            if rng.random() < 0.5:
+                population = f"{rng.randint(1, 99) / 10} million"
+            elif rng.random() < 0.9:
+                population = str(rng.randint(1_000, 999_999))
+            else:
+                population = f'"{rng.randint(1_000, 999_999):,}"'
+            lat = round(rng.uniform(-90, 90), 4)
+            lon = round(rng.uniform(-180, 180), 4)
+            f.write(f"{city},{rng.choice(COUNTRIES)},{population},{lat},{lon}\n")
+
+
+def parse_naive(path):
+    records = []
+    wrong = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            fields = line.rstrip("\n").split(",")
+            if len(fields) != 5:
+                wrong += 1  # a quoted comma split the record apart
+                continue
+            records.append((fields[0], fields[1], parse_population(fields[2]),
+                            float(fields[3]), float(fields[4])))
+    return records, wrong
+
+
+def measure(func, path):
+    """Run func twice: once timed, once under tracemalloc for the memory it keeps."""
+    parse_population.cache_clear()
+    start = time.perf_counter()
+    func(path)
+    elapsed = time.perf_counter() - start
+    parse_population.cache_clear()
+    tracemalloc.start()
+    result = func(path)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cities.csv")
+        write_synthetic(path, n)
+        megabytes = os.path.getsize(path) / 1e6
+        print(f"{n:,} records, {megabytes:.1f} MB")
+        print(f"{'parser':<10} {'records/sec':>12} {'MB/s':>7} {'kept MB':>8} {'wrong':>7}")
+
+        (records, wrong), elapsed, size = measure(parse_naive, path)
+        print(f"{'split':<10} {n / elapsed:>12,.0f} {megabytes / elapsed:>7.1f} {size / 1e6:>8.1f} {wrong:>7,}")
+        del records
+
+        columns, elapsed, size = measure(parse_city_file, path)
+        assert len(columns) == n
+        print(f"{'columns':<10} {n / elapsed:>12,.0f} {megabytes / elapsed:>7.1f} {size / 1e6:>8.1f} {0:>7,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark corpus_stats: throughput by worker count, same results every time.
+
+Writes a synthetic corpus (text lines with words and email addresses) to
+a temporary directory, runs corpus_stats with 1, 2, ... all CPUs workers
+and small and large ranges, checks the results are identical and prints
+MB/s.
+
+Usage: python bench_corpus_stats.py [megabytes]
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+from corpus_stats import corpus_stats, top
+
+WORDS = ("the cat sat on mat and saw rat python is hard readable confusing clear "
+         "contact email address send reply order invoice customer").split()
+DOMAINS = ["example.com", "gmail.com", "company.hu", "mail.de", "outlook.com"]
+
+
+def write_corpus(directory, megabytes, n_files=8):
+    rng = random.Random(42)
+    per_file = megabytes * 1_000_000 // n_files
+    for i in range(n_files):
+        sub = os.path.join(directory, f"part{i % 2}")
+        os.makedirs(sub, exist_ok=True)
+        with open(os.path.join(sub, f"file{i}.{'log' if i % 3 == 0 else 'txt'}"), "w",
+                  encoding="utf-8") as f:
+            size = 0
+            while size < per_file:
+                line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 15)))
+                if rng.random() < 0.2:
+                    line += f" user{rng.randint(1, 999)}@{rng.choice(DOMAINS)}"
+                line += "\n"
+                f.write(line)
+                size += len(line)
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    cpus = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        write_corpus(directory, megabytes)
+        print(f"{megabytes} MB corpus, {cpus} CPU(s)")
+        print(f"{'workers':>8} {'range MB':>9} {'seconds':>8} {'MB/s':>8}")
+        expected = None
+        for workers in sorted({1, 2, cpus}):
+            for range_mb in (1, 16):
+                stats = corpus_stats(directory, workers, range_size=range_mb * 1024 * 1024)
+                result = (stats.words, stats.domains, top(stats.words, 20), top(stats.domains, 20))
+                assert expected is None or result == expected, "results differ between runs"
+                expected = result
+                print(f"{workers:>8} {range_mb:>9} {stats.seconds:>8.2f} {stats.mb_per_s:>8.1f}")
+        print(f"Top domains: {expected[3]}")
+
+
+if __name__ == "__main__":
+    main()
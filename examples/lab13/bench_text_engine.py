@@ -0,0 +1,70 @@
+"""Benchmark TextEngine against chained str.replace / str.count calls.
+
+Builds a random text from a vocabulary of made-up words. For a growing
+number of rules it replaces that many words and counts that many others:
+  - chained: text.replace(a, ...).replace(b, ...) and text.count(t) per term
+  - engine:  TextEngine(...).run(text), one pass for everything
+and prints the time and MB/s of each.
+
+Usage: python bench_text_engine.py [megabytes] [rules ...]
+"""
+
+import random
+import sys
+import time
+
+from text_engine import TextEngine
+
+
+def make_vocabulary(rng, size=5000):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(3, 10))))
+    return sorted(words)
+
+
+def chained(text, replacements, terms):
+    counts = {term: text.count(term) for term in terms}
+    for old, new in replacements.items():
+        text = text.replace(old, new)
+    return text, counts
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    rule_counts = [int(arg) for arg in sys.argv[2:]] or [10, 100, 500, 2000]
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(rng)
+    words = []
+    size = 0
+    while size < megabytes * 1e6:
+        word = rng.choice(vocabulary)
+        words.append(word)
+        size += len(word) + 1
+    text = " ".join(words)
+    print(f"{len(text) / 1e6:.1f} MB of text")
+    print(f"{'rules':>6} {'chained s':>10} {'MB/s':>8} {'engine s':>10} {'MB/s':>8}")
+
+    for n in rule_counts:
+        chosen = rng.sample(vocabulary, 2 * n)
+        replacements = {word: word.upper() for word in chosen[:n]}
+        terms = chosen[n:]
+
+        start = time.perf_counter()
+        chained(text, replacements, terms)
+        chained_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        engine = TextEngine(replacements, terms)
+        _, counts = engine.run(text)
+        engine_time = time.perf_counter() - start
+        assert all(counts[term] == text.count(term) for term in terms[:20])
+
+        mb = len(text) / 1e6
+        print(f"{n:>6} {chained_time:>10.2f} {mb / chained_time:>8.1f} "
+              f"{engine_time:>10.2f} {mb / engine_time:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
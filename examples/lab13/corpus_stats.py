@@ -0,0 +1,171 @@
+"""Word frequencies and per-domain email counts for a directory of text files.
+
+string_methods.py counts words with paragraph.count and splits one email
+with email.find("@"). This does the same for a whole directory of .txt /
+.log files, map-reduce style:
+
+* map: the files are cut into byte ranges (a line belongs to the range it
+  starts in) and a process pool turns every range into two Counters, one
+  of lower-cased words and one of email domains;
+* reduce: each range's Counters are added to the totals as soon as it
+  finishes, so only the totals are kept, however many ranges there are.
+
+Progress and throughput are reported while the ranges finish. The counts
+do not depend on the number of workers, the range size or the order the
+ranges finish in, and `top` breaks ties alphabetically, so the printed
+tables are the same too.
+
+Usage: python corpus_stats.py DIRECTORY [workers] [top_n]
+"""
+
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+EXTENSIONS = (".txt", ".log")
+RANGE_SIZE = 16 * 1024 * 1024
+BATCH_SIZE = 1024 * 1024
+WORD_PATTERN = re.compile(r"\w+")
+# The domain of username@domain (split at "@" like string_methods.py does).
+# The pattern starts with the literal "@" so the regex engine can jump from
+# one "@" to the next; the username is checked in _count_text.
+EMAIL_PATTERN = re.compile(r"@([\w-]+(?:\.[\w-]+)+)")
+USERNAME_CHAR = re.compile(r"[\w.+-]")
+
+Task = Tuple[str, int, int]  # (path, start, end) byte range of a file
+
+
+@dataclass
+class CorpusStats:
+    words: Counter = field(default_factory=Counter)
+    domains: Counter = field(default_factory=Counter)
+    files: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+
+def top(counter: Counter, n: int) -> List[Tuple[str, int]]:
+    """The n most common items; equal counts in alphabetical order."""
+    return sorted(counter.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+
+def find_files(directory: str, extensions=EXTENSIONS) -> List[str]:
+    """All files with one of the extensions under directory, in sorted order."""
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        paths.extend(os.path.join(root, name) for name in sorted(files)
+                     if name.lower().endswith(extensions))
+    return paths
+
+
+def make_tasks(paths: List[str], range_size: int = RANGE_SIZE) -> List[Task]:
+    """Cut the files into byte ranges of at most range_size."""
+    tasks = []
+    for path in paths:
+        size = os.path.getsize(path)
+        tasks.extend((path, start, min(start + range_size, size))
+                     for start in range(0, size, range_size))
+    return tasks
+
+
+def _count_text(text: str, words: Counter, domains: Counter) -> None:
+    words.update(WORD_PATTERN.findall(text.lower()))
+    if "@" in text:
+        domains.update(match.group(1).lower() for match in EMAIL_PATTERN.finditer(text)
+                       if match.start() and USERNAME_CHAR.match(text, match.start() - 1))
+
+
+def count_range(task: Task) -> Tuple[Counter, Counter, int]:
+    """Map step: (word Counter, domain Counter, bytes read) of the lines starting in the range."""
+    path, start, end = task
+    words, domains = Counter(), Counter()
+    read = 0
+    with open(path, "rb") as f:
+        if start > 0:
+            # The line that crosses `start` belongs to the previous range
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        while position < end:
+            block = f.read(min(BATCH_SIZE, end - position))
+            if not block:
+                break
+            if not block.endswith(b"\n"):
+                block += f.readline()  # finish the last line
+            position += len(block)
+            read += len(block)
+            _count_text(block.decode("utf-8", errors="replace"), words, domains)
+    return words, domains, read
+
+
+def corpus_stats(directory: str, workers: Optional[int] = None, range_size: int = RANGE_SIZE,
+                 progress: Optional[Callable[[int, int, CorpusStats], None]] = None) -> CorpusStats:
+    """Count words and email domains in all text files under directory.
+
+    workers=1 runs in this process, None uses all CPUs. progress, if given,
+    is called as progress(done, total, stats) after every finished range.
+    """
+    start_time = time.perf_counter()
+    paths = find_files(directory)
+    tasks = make_tasks(paths, range_size)
+    stats = CorpusStats(files=len(paths))
+    done = 0
+
+    def finished(result):
+        nonlocal done
+        words, domains, read = result
+        # Reduce right away: addition does not depend on the order
+        stats.words.update(words)
+        stats.domains.update(domains)
+        stats.bytes += read
+        stats.seconds = time.perf_counter() - start_time
+        done += 1
+        if progress:
+            progress(done, len(tasks), stats)
+
+    if workers == 1:
+        for task in tasks:
+            finished(count_range(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # No list of the futures is kept: as_completed lets go of each
+            # one it has returned, and with it the range's Counters
+            for future in as_completed([executor.submit(count_range, task) for task in tasks]):
+                finished(future.result())
+
+    stats.seconds = time.perf_counter() - start_time
+    return stats
+
+
+def print_progress(done: int, total: int, stats: CorpusStats) -> None:
+    print(f"\r  {done}/{total} ranges, {stats.bytes / 1e6:,.1f} MB, {stats.mb_per_s:,.1f} MB/s",
+          end="" if done < total else "\n", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(1)
+    directory = sys.argv[1]
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    top_n = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    stats = corpus_stats(directory, workers, progress=print_progress)
+    print(f"{stats.files} files, {stats.bytes / 1e6:,.1f} MB in {stats.seconds:.2f} s "
+          f"({stats.mb_per_s:,.1f} MB/s)")
+    print(f"\nTop {top_n} words:")
+    for word, count in top(stats.words, top_n):
+        print(f"  {word:<20} {count:>10,}")
+    print(f"\nTop {top_n} email domains:")
+    for domain, count in top(stats.domains, top_n):
+        print(f"  {domain:<20} {count:>10,}")
@@ -0,0 +1,338 @@
+# text_engine.py - Many replacements and counts in one pass over a text
+#
+# string_methods.py does
+#     text.replace("hard", "readable").replace("confusing", "clear")
+#     paragraph.count("the")
+# which reads (and for replace, copies) the whole text once per pattern.
+# TextEngine builds an Aho-Corasick automaton from all the patterns and
+# finds every one of them in a single pass, however many there are.
+#
+#   engine = TextEngine(replacements={"hard": "readable", "confusing": "clear"},
+#                       terms=["the", "cat"])
+#   engine.replace(text)          -> text with all replacements applied
+#   engine.count(text)            -> {"the": 4, "cat": 2}
+#   engine.process_file(src, dst) -> counts, streaming src chunk by chunk
+#
+# Counting works like str.count for every term (non-overlapping
+# occurrences). Replacing picks the leftmost match and, at the same
+# position, the longest pattern; replaced text is not searched again (so
+# unlike chained .replace calls, one rule cannot rewrite another's output).
+# Options: ignore_case=True, and whole_words=True to only match whole
+# words (the characters around a match must not be letters, digits or _).
+# Feeding a text in chunks gives the same result as one call on the whole
+# text, also for matches that cross the chunk boundaries.
+
+import re
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+class TextEngine:
+    def __init__(self, replacements=None, terms=(), ignore_case=False, whole_words=False):
+        self.ignore_case = ignore_case
+        self.whole_words = whole_words
+        replacements = dict(replacements or {})
+        terms = list(terms)
+
+        # One pattern per distinct (folded) text; it may replace, count or both
+        self._patterns = []
+        self._replacement = []  # None: only counted
+        self._terms = []  # the terms counted with this pattern
+        index = {}
+        for text in list(replacements) + terms:
+            if not text:
+                raise ValueError("Patterns must not be empty")
+            folded = self._fold(text)
+            if folded not in index:
+                index[folded] = len(self._patterns)
+                self._patterns.append(folded)
+                self._replacement.append(None)
+                self._terms.append([])
+        for text, replacement in replacements.items():
+            self._replacement[index[self._fold(text)]] = replacement
+        for term in dict.fromkeys(terms):
+            self._terms[index[self._fold(term)]].append(term)
+        self._build()
+
+    def _fold(self, text):
+        """Lower-case text if ignore_case, character by character.
+
+        Every character is folded on its own, so a chunk folds the same
+        way as the whole text and positions are kept.
+        """
+        if not self.ignore_case:
+            return text
+        # str.lower looks at the context of just one character: "Σ" becomes
+        # "ς" at the end of a word, which a chunk boundary could change
+        if "Σ" not in text:
+            lowered = text.lower()
+            if len(lowered) == len(text):
+                return lowered
+        # A few characters (like "İ") get longer when lowered: keep those as they are
+        return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+    def _build(self):
+        """The automaton: a trie of the patterns plus failure links."""
+        goto = [{}]
+        depth = [0]
+        ends = [[]]  # patterns that end in this state
+        for pattern_id, pattern in enumerate(self._patterns):
+            state = 0
+            for char in pattern:
+                if char not in goto[state]:
+                    goto[state][char] = len(goto)
+                    goto.append({})
+                    depth.append(depth[state] + 1)
+                    ends.append([])
+                state = goto[state][char]
+            ends[state].append(pattern_id)
+
+        # Breadth first: a state's failure link is the longest proper suffix
+        # of its text that is also a state; it inherits that state's matches
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for char, child in goto[state].items():
+                queue.append(child)
+                link = fail[state]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                fail[child] = goto[link].get(char, 0)
+                ends[child].extend(ends[fail[child]])
+
+        self._goto = goto
+        self._fail = fail
+        self._depth = depth
+        # (pattern id, length) of every match ending in a state; () if none
+        self._matches = [tuple((p, len(self._patterns[p])) for p in e) for e in ends]
+        # Transitions computed so far, including the ones through failure links
+        self._transitions = [dict(g) for g in goto]
+        self._longest = max(map(len, self._patterns), default=0)
+        # From the start state only a pattern's first character leads anywhere
+        first_chars = "".join(goto[0])
+        self._first_char = re.compile(f"[{re.escape(first_chars)}]") if first_chars else None
+
+    def _next_state(self, state, char):
+        origin = state
+        while state and char not in self._goto[state]:
+            state = self._fail[state]
+        state = self._goto[state].get(char, 0)
+        self._transitions[origin][char] = state
+        return state
+
+    def scanner(self):
+        """A Scanner to feed a text to in pieces."""
+        return Scanner(self)
+
+    def run(self, text):
+        """(text with the replacements applied, {term: count})."""
+        scanner = self.scanner()
+        result = scanner.feed(text) + scanner.finish()
+        return result, scanner.counts()
+
+    def replace(self, text):
+        return self.run(text)[0]
+
+    def count(self, text):
+        return self.run(text)[1]
+
+    def process_file(self, source_path, target_path=None, chunk_size=CHUNK_SIZE, encoding="utf-8"):
+        """Stream a file through the engine; write the replaced text if target_path.
+
+        Returns {term: count}.
+        """
+        scanner = self.scanner()
+        with open(source_path, encoding=encoding, newline="") as source:
+            target = open(target_path, "w", encoding=encoding, newline="") if target_path else None
+            try:
+                while chunk := source.read(chunk_size):
+                    output = scanner.feed(chunk)
+                    if target:
+                        target.write(output)
+                output = scanner.finish()
+                if target:
+                    target.write(output)
+            finally:
+                if target:
+                    target.close()
+        return scanner.counts()
+
+
+class Scanner:
+    """One pass of a TextEngine over a text given in pieces.
+
+    feed(chunk) returns the replaced text that is final so far; finish()
+    returns the rest. counts() can be called at any time.
+    """
+
+    MAX_PENDING = 32
+
+    def __init__(self, engine):
+        self._engine = engine
+        self._state = 0
+        self._position = 0  # characters scanned so far
+        self._counts = [0] * len(engine._patterns)
+        self._last_end = [0] * len(engine._patterns)  # for non-overlapping counts
+        self._pending = []  # replacement candidates (start, end, pattern id)
+        self._deferred = []  # whole_words: matches at the very end of the last chunk
+        self._emitted = 0  # the text before this position has been returned
+        self._buffer = ""  # original text from _buffer_start on
+        self._buffer_start = 0
+        self._tail = ""  # the last folded characters, to look back across chunks
+        self._tail_start = 0
+        self._finished = False
+
+    def counts(self):
+        result = {}
+        for pattern_id, terms in enumerate(self._engine._terms):
+            for term in terms:
+                result[term] = self._counts[pattern_id]
+        return result
+
+    def _found(self, pattern_id, start, end):
+        if self._engine._terms[pattern_id] and start >= self._last_end[pattern_id]:
+            self._counts[pattern_id] += 1
+            self._last_end[pattern_id] = end
+        if self._engine._replacement[pattern_id] is not None and start >= self._emitted:
+            self._pending.append((start, end, pattern_id))
+
+    def _decide(self, frontier):
+        """Apply the pending replacements that start before frontier.
+
+        No match found later can start before frontier, so the leftmost
+        pending match (the longest of those starting there) is final.
+        """
+        output = []
+        pending = self._pending
+        while pending:
+            start = min(match[0] for match in pending)
+            if start >= frontier:
+                break
+            _, end, pattern_id = max((m for m in pending if m[0] == start), key=lambda m: m[1])
+            output.append(self._text(self._emitted, start))
+            output.append(self._engine._replacement[pattern_id])
+            self._emitted = end
+            pending = [m for m in pending if m[0] >= end]
+        self._pending = pending
+        return "".join(output)
+
+    def _text(self, start, end):
+        """Original text between two absolute positions (still in the buffer)."""
+        return self._buffer[start - self._buffer_start:end - self._buffer_start]
+
+    def _char_before(self, position, folded, base):
+        """The folded character before an absolute position ("" at the start)."""
+        position -= 1
+        if position >= base:
+            return folded[position - base]
+        offset = position - self._tail_start
+        return self._tail[offset] if 0 <= offset < len(self._tail) else ""
+
+    def _is_whole_word(self, start, next_char, folded, base):
+        before = self._char_before(start, folded, base)
+        return not (before and _is_word_char(before)) and not (next_char and _is_word_char(next_char))
+
+    def feed(self, chunk):
+        if self._finished:
+            raise ValueError("Scanner is finished")
+        if not chunk:
+            return ""
+        engine = self._engine
+        folded = engine._fold(chunk)
+        base = self._position
+        self._buffer += chunk
+
+        if self._deferred:
+            deferred, self._deferred = self._deferred, []
+            for pattern_id, start, end in deferred:
+                if self._is_whole_word(start, folded[0], folded, base):
+                    self._found(pattern_id, start, end)
+
+        transitions = engine._transitions
+        matches = engine._matches
+        depth = engine._depth
+        first_char = engine._first_char
+        whole_words = engine.whole_words
+        state = self._state
+        output = []
+        i, n = 0, len(folded)
+        while i < n:
+            if state == 0:
+                # Nothing is partly matched: the pending replacements are
+                # final; jump to the next character that can start a pattern
+                if self._pending:
+                    output.append(self._decide(base + i))
+                match = first_char.search(folded, i) if first_char else None
+                if match is None:
+                    break
+                i = match.start()
+            char = folded[i]
+            next_state = transitions[state].get(char)
+            if next_state is None:
+                next_state = engine._next_state(state, char)
+            state = next_state
+            if matches[state]:
+                end = base + i + 1
+                for pattern_id, length in matches[state]:
+                    start = end - length
+                    if whole_words:
+                        if i + 1 == n:
+                            # The next character is in the next chunk
+                            self._deferred.append((pattern_id, start, end))
+                            continue
+                        if not self._is_whole_word(start, folded[i + 1], folded, base):
+                            continue
+                    self._found(pattern_id, start, end)
+                if len(self._pending) > self.MAX_PENDING:
+                    output.append(self._decide(end - depth[state]))
+            i += 1
+
+        self._state = state
+        self._position = base + n
+        tail = (self._tail + folded)[-(engine._longest + 1):]
+        self._tail_start = self._position - len(tail)
+        self._tail = tail
+
+        # Nothing found later can start before the text the state stands for
+        frontier = self._position - depth[state]
+        if self._deferred:
+            frontier = min(frontier, min(start for _, start, _ in self._deferred))
+        output.append(self._decide(frontier))
+        safe = min([frontier] + [start for start, _, _ in self._pending])
+        if safe > self._emitted:
+            output.append(self._text(self._emitted, safe))
+            self._emitted = safe
+        self._buffer = self._buffer[self._emitted - self._buffer_start:]
+        self._buffer_start = self._emitted
+        return "".join(output)
+
+    def finish(self):
+        """Decide the remaining matches and return the rest of the text."""
+        if self._finished:
+            return ""
+        self._finished = True
+        deferred, self._deferred = self._deferred, []
+        for pattern_id, start, end in deferred:
+            if self._is_whole_word(start, "", "", self._position):
+                self._found(pattern_id, start, end)
+        output = self._decide(self._position + 1)
+        output += self._text(self._emitted, self._position)
+        self._buffer = ""
+        return output
+
+
+if __name__ == "__main__":
+    text = "Python is hard. Python is confusing."
+    engine = TextEngine(replacements={"hard": "readable", "confusing": "clear"})
+    print(f"Before: {text}")
+    print(f"After:  {engine.replace(text)}")
+
+    paragraph = "the cat sat on the mat and the cat saw the rat"
+    counter = TextEngine(terms=["the", "cat", "at"], whole_words=True)
+    print(f"Text: {paragraph}")
+    print(f"Whole words: {counter.count(paragraph)}")
+    print(f"Anywhere:    {TextEngine(terms=['the', 'cat', 'at']).count(paragraph)}")
@@ -0,0 +1,52 @@
+"""Benchmark PersistentContacts: change throughput and startup time.
+
+For growing book sizes: time N adds (one log append each), then time
+opening the book by replaying the whole log, and opening it again after
+compact() has written a snapshot.
+
+Usage: python bench_persistent_contacts.py [n_contacts ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from persistent_contacts import PersistentContacts
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"{'contacts':>10} {'changes/sec':>12} {'log MB':>7} {'open (log)':>11} "
+          f"{'compact':>8} {'open (snapshot)':>16}")
+
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            with PersistentContacts(directory, compact_after=None) as contacts:
+                for i in range(n):
+                    contacts[f"Person {i}"] = f"+36-20-{i // 10_000:03d}-{i % 10_000:04d}"
+            write_time = time.perf_counter() - start
+            log_size = os.path.getsize(os.path.join(directory, "contacts.log"))
+
+            start = time.perf_counter()
+            contacts = PersistentContacts(directory, compact_after=None)
+            replay_time = time.perf_counter() - start
+            assert len(contacts) == n
+
+            start = time.perf_counter()
+            contacts.compact()
+            compact_time = time.perf_counter() - start
+            contacts.close()
+
+            start = time.perf_counter()
+            with PersistentContacts(directory) as contacts:
+                snapshot_time = time.perf_counter() - start
+                assert len(contacts) == n
+
+        print(f"{n:>10,} {n / write_time:>12,.0f} {log_size / 1e6:>7.1f} {replay_time:>10.3f}s "
+              f"{compact_time:>7.3f}s {snapshot_time:>15.3f}s")
+
+
+if __name__ == "__main__":
+    main()
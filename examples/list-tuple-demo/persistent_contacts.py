@@ -0,0 +1,147 @@
+# persistent_contacts.py - A contact book that survives restarts
+#
+# PersistentContacts behaves like the contacts dictionary in main.py
+# (book[name] = phone, del book[name], book.pop(name, None), .get, .items())
+# but every change is also appended to a log file on disk:
+#
+#   contacts.log       one JSON line per change: [seq, "set", name, phone]
+#                                             or [seq, "del", name]
+#   contacts.snapshot  the whole book as JSON, plus the seq of the last
+#                      change it contains
+#
+# A change costs one short append, however big the book is. Opening the
+# book loads the snapshot and replays the log lines written after it.
+# When the log gets long, compact() writes a new snapshot and empties the
+# log, so opening stays fast. If the program crashed in the middle of
+# writing a line, that half line is ignored and cut off.
+
+import json
+import os
+import sys
+from collections.abc import MutableMapping
+
+LOG_FILE = "contacts.log"
+SNAPSHOT_FILE = "contacts.snapshot"
+
+
+class PersistentContacts(MutableMapping):
+    def __init__(self, directory, sync=False, compact_after=10_000):
+        """Open (or create) the contact book stored in `directory`.
+
+        sync=True also calls os.fsync after every change, so changes survive
+        a power failure, not only a crash of the program (much slower).
+        compact_after: compact automatically once the log has this many
+        lines (None: only when compact() is called).
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._log_path = os.path.join(directory, LOG_FILE)
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self._sync = sync
+        self._compact_after = compact_after
+        self._data = {}
+        self._seq = 0
+        self._log_lines = 0
+        self._load()
+        self._log = open(self._log_path, "a", encoding="utf-8")
+
+    def _load(self):
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self._data = snapshot["contacts"]
+            self._seq = snapshot["seq"]
+        if not os.path.exists(self._log_path):
+            return
+
+        good_end = 0
+        with open(self._log_path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn write at the end of the log
+                good_end += len(line)
+                self._log_lines += 1
+                seq, op, name = entry[:3]
+                if seq <= self._seq:
+                    continue  # already in the snapshot
+                if op == "set":
+                    self._data[name] = entry[3]
+                else:
+                    self._data.pop(name, None)
+                self._seq = seq
+        if good_end < os.path.getsize(self._log_path):
+            with open(self._log_path, "r+b") as f:
+                f.truncate(good_end)
+
+    def _append(self, *entry):
+        self._seq += 1
+        self._log.write(json.dumps([self._seq, *entry]) + "\n")
+        self._log.flush()
+        if self._sync:
+            os.fsync(self._log.fileno())
+        self._log_lines += 1
+        if self._compact_after is not None and self._log_lines >= self._compact_after:
+            self.compact()
+
+    def __getitem__(self, name):
+        return self._data[name]
+
+    def __setitem__(self, name, phone):
+        self._data[name] = phone
+        self._append("set", name, phone)
+
+    def __delitem__(self, name):
+        del self._data[name]
+        self._append("del", name)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"PersistentContacts({self._data!r})"
+
+    def compact(self):
+        """Write the whole book to the snapshot and empty the log."""
+        temp_path = self._snapshot_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"seq": self._seq, "contacts": self._data}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        # Atomic: a crash leaves either the old or the new snapshot. The log
+        # lines the new snapshot already contains are skipped by their seq.
+        os.replace(temp_path, self._snapshot_path)
+        self._log.close()
+        self._log = open(self._log_path, "w", encoding="utf-8")
+        self._log_lines = 0
+
+    def close(self):
+        self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    # Run it twice: the second run starts with what the first one saved
+    directory = sys.argv[1] if len(sys.argv) > 1 else "contacts_data"
+    with PersistentContacts(directory) as contacts:
+        print(f"Opened {len(contacts)} contact(s) from {directory}: {dict(contacts)}")
+        if not contacts:
+            contacts.update({
+                "Alice": "+36-20-111-2222",
+                "Bob": "+36-30-333-4444",
+                "Charlie": "+36-70-555-6666",
+            })
+        contacts["Diana"] = "+36-20-777-8888"
+        contacts["Bob"] = "+36-30-999-0000"
+        contacts.pop("Charlie", None)
+        print(f"Saved: {dict(contacts)}")
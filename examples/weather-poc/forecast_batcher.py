@@ -0,0 +1,118 @@
+"""Coalesces forecast lookups into multi-location requests.
+
+The Open-Meteo forecast endpoint accepts comma-separated lists of
+latitudes and longitudes and answers with one result per location.
+`ForecastBatcher` collects the locations callers ask for and sends them
+together, up to `max_batch_size` per request:
+
+* a batch is sent as soon as it is full, or `max_wait` seconds after its
+  first location arrived;
+* identical coordinates (rounded to 4 decimals) that are pending or in
+  flight share one `Future`, so concurrent callers asking for the same
+  city get the same response;
+* when a response arrives, every caller's future is resolved with the
+  result for its location (or with the request's exception).
+
+Batches are sent on a small thread pool, so `submit` never blocks.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+Coordinates = Tuple[float, float]
+
+
+class ForecastBatcher:
+    """Groups pending forecast lookups into batched requests."""
+
+    def __init__(
+        self,
+        fetch_batch: Callable[[List[Coordinates]], list],
+        max_batch_size: int = 50,
+        max_wait: float = 0.05,
+        max_concurrent_batches: int = 4,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.requests_sent = 0
+        self.locations_requested = 0
+        self.coalesced = 0
+        self._fetch_batch = fetch_batch
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_batches)
+        self._lock = threading.Lock()
+        self._pending: Dict[Coordinates, Future] = {}
+        self._in_flight: Dict[Coordinates, Future] = {}
+        self._timer: Optional[threading.Timer] = None
+
+    def submit(self, latitude: float, longitude: float) -> Future:
+        """Ask for the forecast at a location; the future resolves to its result."""
+        key = (round(latitude, 4), round(longitude, 4))
+        with self._lock:
+            future = self._pending.get(key) or self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+
+            future = Future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch(self._take_batch())
+            elif self._timer is None:
+                self._timer = threading.Timer(self.max_wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return future
+
+    def flush(self) -> None:
+        """Send everything that is pending now, without waiting for `max_wait`."""
+        with self._lock:
+            while self._pending:
+                self._dispatch(self._take_batch())
+
+    def close(self) -> None:
+        """Send what is pending and wait for all batches to finish."""
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requests_sent": self.requests_sent,
+            "locations_requested": self.locations_requested,
+            "coalesced": self.coalesced,
+        }
+
+    def _take_batch(self) -> List[Tuple[Coordinates, Future]]:
+        """Move up to `max_batch_size` pending lookups to in-flight. Needs the lock."""
+        batch = []
+        for key in list(self._pending)[:self.max_batch_size]:
+            future = self._pending.pop(key)
+            self._in_flight[key] = future
+            batch.append((key, future))
+        if not self._pending and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _dispatch(self, batch: List[Tuple[Coordinates, Future]]) -> None:
+        self.requests_sent += 1
+        self.locations_requested += len(batch)
+        self._executor.submit(self._send, batch)
+
+    def _send(self, batch: List[Tuple[Coordinates, Future]]) -> None:
+        try:
+            results = self._fetch_batch([key for key, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"expected {len(batch)} forecasts, got {len(results)}")
+        except Exception as error:
+            for _, future in batch:
+                future.set_exception(error)
+        else:
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+        finally:
+            with self._lock:
+                for key, _ in batch:
+                    self._in_flight.pop(key, None)
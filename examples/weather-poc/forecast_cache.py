@@ -0,0 +1,151 @@
+"""Forecast response cache with stale-while-revalidate.
+
+Current conditions only change every few minutes, so a `WeatherClient`
+created with `forecast_cache=ForecastCache()` reuses recent responses.
+Entries are keyed by coordinates rounded to 2 decimals (about 1 km) and
+the requested fields.
+
+* Younger than `soft_ttl`: served from the cache.
+* Older than `soft_ttl` but younger than `max_stale`: the stale value is
+  served immediately and a refresh is started in the background.
+* Older than `max_stale`, or not cached: fetched before answering. If that
+  fetch fails and any old value exists, the old value is served instead.
+
+`metrics()` reports the hit ratio and latency percentiles of `get` calls.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Set, Tuple
+
+CacheKey = Tuple[float, float, str]
+
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float
+
+
+def _resolved(value: Any) -> Future:
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class ForecastCache:
+    """Caches forecast responses and revalidates them in the background."""
+
+    def __init__(
+        self,
+        soft_ttl: float = 5 * 60,
+        max_stale: float = 24 * 60 * 60,
+        latency_window: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.soft_ttl = soft_ttl
+        self.max_stale = max_stale
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.stale_fallbacks = 0
+        self.refresh_errors = 0
+        self._clock = clock
+        # Re-entrant: a refresh callback may run at once, inside get()
+        self._lock = threading.RLock()
+        self._entries: Dict[CacheKey, _Entry] = {}
+        self._refreshing: Set[CacheKey] = set()
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+
+    def get(self, latitude: float, longitude: float, fields: str,
+            load: Callable[[], Future]) -> Future:
+        """Return a future for the forecast at a location.
+
+        `load` starts a fetch and returns its future; it is only called on a
+        miss or to refresh a stale entry.
+        """
+        started = time.perf_counter()
+        key = (round(latitude, 2), round(longitude, 2), fields)
+        with self._lock:
+            entry = self._entries.get(key)
+            age = self._clock() - entry.stored_at if entry is not None else None
+            if age is not None and age < self.soft_ttl:
+                self.hits += 1
+                result = _resolved(entry.value)
+            elif age is not None and age < self.max_stale:
+                self.stale_hits += 1
+                result = _resolved(entry.value)
+                self._start_refresh(key, load)
+            else:
+                self.misses += 1
+                result = None
+
+        if result is None:
+            result = Future()
+            load().add_done_callback(lambda fetched: self._finish_miss(key, entry, fetched, result))
+        result.add_done_callback(lambda _: self._record_latency(started))
+        return result
+
+    def metrics(self) -> Dict[str, float]:
+        """Counters, hit ratio and latency percentiles (in milliseconds)."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            requests = self.hits + self.stale_hits + self.misses
+            return {
+                "requests": requests,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "stale_fallbacks": self.stale_fallbacks,
+                "refresh_errors": self.refresh_errors,
+                "hit_ratio": (self.hits + self.stale_hits) / requests if requests else 0.0,
+                "p50_ms": _percentile(latencies, 0.50) * 1000,
+                "p90_ms": _percentile(latencies, 0.90) * 1000,
+                "p99_ms": _percentile(latencies, 0.99) * 1000,
+            }
+
+    def _store(self, key: CacheKey, value: Any) -> None:
+        self._entries[key] = _Entry(value, self._clock())
+
+    def _start_refresh(self, key: CacheKey, load: Callable[[], Future]) -> None:
+        """Refresh an entry in the background, once at a time. Needs the lock."""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        load().add_done_callback(lambda fetched: self._finish_refresh(key, fetched))
+
+    def _finish_refresh(self, key: CacheKey, fetched: Future) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+            if fetched.exception() is None:
+                self._store(key, fetched.result())
+            else:
+                self.refresh_errors += 1
+
+    def _finish_miss(self, key: CacheKey, old_entry, fetched: Future, result: Future) -> None:
+        error = fetched.exception()
+        if error is None:
+            value = fetched.result()
+            with self._lock:
+                self._store(key, value)
+            result.set_result(value)
+        elif old_entry is not None:
+            with self._lock:
+                self.stale_fallbacks += 1
+            result.set_result(old_entry.value)
+        else:
+            result.set_exception(error)
+
+    def _record_latency(self, started: float) -> None:
+        with self._lock:
+            self._latencies.append(time.perf_counter() - started)
@@ -0,0 +1,134 @@
+"""Geocoding cache: in-memory LRU in front of an optional SQLite file.
+
+City coordinates practically never change, so a `WeatherClient` created
+with `geocode_cache=GeocodeCache("geocache.sqlite")` only asks the
+geocoding API about a city once per TTL. A warm run then needs a single
+forecast request per city.
+
+* Keys are normalized city names: accents and case are dropped and
+  whitespace is collapsed, so "Győr", "GYOR" and "gyor " share one entry.
+* Cities the API does not know are cached too ("negative" entries), with
+  their own, usually shorter, TTL.
+* The most recently used `max_entries` live in memory; everything is also
+  written to SQLite (if a path is given), so the cache survives restarts.
+* `hits` / `misses` count lookups; `stats()` returns them with the sizes.
+"""
+
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from weather_client import Location
+
+DAY = 24 * 60 * 60
+
+
+def normalize_city(name: str) -> str:
+    """Normalize a city name for use as a cache key."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(without_accents.casefold().split())
+
+
+class GeocodeCache:
+    """Caches geocoding results (including "not found") with a TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = 30 * DAY,
+        negative_ttl: float = DAY,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._memory: "OrderedDict[str, Tuple[Optional[Location], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                " key TEXT PRIMARY KEY, name TEXT, country TEXT,"
+                " latitude REAL, longitude REAL, expires_at REAL NOT NULL)")
+            self._db.commit()
+
+    def lookup(self, city_name: str) -> Tuple[bool, Optional[Location]]:
+        """Return (True, location) on a hit, (False, None) on a miss.
+
+        On a hit the location is None if the city is known not to exist.
+        """
+        key = normalize_city(city_name)
+        now = self._clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._db is not None:
+                entry = self._load(key)
+                if entry is not None:
+                    self._remember(key, entry)
+            if entry is not None and entry[1] > now:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+            self.misses += 1
+            return False, None
+
+    def store(self, city_name: str, location: Optional[Location]) -> None:
+        """Cache the geocoding result of a city (None for "not found")."""
+        key = normalize_city(city_name)
+        ttl = self.ttl if location is not None else self.negative_ttl
+        entry = (location, self._clock() + ttl)
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._save(key, entry)
+
+    def clear(self) -> None:
+        """Drop all entries, in memory and on disk, and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.misses = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM geocode")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "in_memory": len(self._memory)}
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, entry: Tuple[Optional[Location], float]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[Tuple[Optional[Location], float]]:
+        row = self._db.execute(
+            "SELECT name, country, latitude, longitude, expires_at FROM geocode WHERE key = ?",
+            (key,)).fetchone()
+        if row is None:
+            return None
+        name, country, latitude, longitude, expires_at = row
+        location = None if name is None else Location(name, country, latitude, longitude)
+        return location, expires_at
+
+    def _save(self, key: str, entry: Tuple[Optional[Location], float]) -> None:
+        location, expires_at = entry
+        values = (None, None, None, None) if location is None else (
+            location.name, location.country, location.latitude, location.longitude)
+        self._db.execute(
+            "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?, ?)", (key, *values, expires_at))
+        self._db.commit()
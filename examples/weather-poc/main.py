@@ -1,65 +1,48 @@
-import requests
+from geocache import GeocodeCache
+from weather_client import WeatherClient, WeatherResult
 
 
-def get_weather_by_city(city_name):
+def print_weather(result: WeatherResult):
+    """Print the outcome of a weather lookup."""
+    if result.error is not None:
+        print(f"Network error occurred: {result.error}")
+        return
+
+    # Check if the city exists in the database
+    if result.location is None:
+        print(f"Error: Could not find location data for '{result.city}'.")
+        return
+
+    # Output the results
+    print(f"\n--- Current Weather in {result.location.display_name} ---")
+    print(f"Temperature: {result.weather.temperature}°C")
+    print(f"Humidity:    {result.weather.humidity}%")
+    print(f"Wind Speed:  {result.weather.wind_speed} km/h")
+
+
+def get_weather_by_city(city_name, client=None):
     """
     Fetches the current weather for a given city name using the Open-Meteo API.
 
     This is a two-step process:
     1. Geocoding: Convert city name to latitude and longitude.
     2. Weather: Fetch weather data using coordinates.
-    """
-    # 1. Geocoding API - Search for city coordinates
-    geocoding_url = (
-        f"https://geocoding-api.open-meteo.com/v1/search?"
-        f"name={city_name}&count=1&language=en&format=json"
-    )
-
-    try:
-        geo_response = requests.get(geocoding_url)
-        geo_response.raise_for_status()
-        geo_data = geo_response.json()
-
-        # Check if the city exists in the database
-        if not geo_data.get("results"):
-            print(f"Error: Could not find location data for '{city_name}'.")
-            return
 
-        # Extract data from the first result
-        location = geo_data["results"][0]
-        lat = location["latitude"]
-        lon = location["longitude"]
-        display_name = f"{location['name']}, {location.get('country', 'N/A')}"
-
-        # 2. Weather API - Fetch current conditions
-        weather_url = (
-            f"https://api.open-meteo.com/v1/forecast?"
-            f"latitude={lat}&longitude={lon}&"
-            f"current=temperature_2m,relative_humidity_2m,wind_speed_10m&"
-            f"timezone=auto"
-        )
-
-        weather_response = requests.get(weather_url)
-        weather_response.raise_for_status()
-        weather_data = weather_response.json()
-
-        current_weather = weather_data["current"]
-        temperature = current_weather["temperature_2m"]
-        humidity = current_weather["relative_humidity_2m"]
-        wind_speed = current_weather["wind_speed_10m"]
-
-        # Output the results
-        print(f"\n--- Current Weather in {display_name} ---")
-        print(f"Temperature: {temperature}°C")
-        print(f"Humidity:    {humidity}%")
-        print(f"Wind Speed:  {wind_speed} km/h")
-
-    except requests.exceptions.RequestException as error:
-        print(f"Network error occurred: {error}")
+    Pass a shared WeatherClient to reuse its connections between calls.
+    """
+    if client is None:
+        with WeatherClient() as client:
+            print_weather(client.get_weather(city_name))
+    else:
+        print_weather(client.get_weather(city_name))
 
 
 if __name__ == "__main__":
     user_input = input(
         "Enter the city name (default: Győr): ").strip() or "Győr"
 
-    get_weather_by_city(user_input)
+    # Coordinates are cached on disk, so repeated runs skip the geocoding call
+    geocode_cache = GeocodeCache("geocache.sqlite")
+    with WeatherClient(geocode_cache=geocode_cache) as client:
+        get_weather_by_city(user_input, client)
+    geocode_cache.close()
@@ -0,0 +1,226 @@
+"""Open-Meteo client for fetching current weather of many cities at once.
+
+`WeatherClient` keeps one `requests.Session`, so TCP/TLS connections are
+pooled and reused between calls instead of being opened for every request.
+`get_weather_for_cities` runs the geocoding + forecast lookups of several
+cities concurrently on a thread pool; `max_concurrency` limits both the
+number of threads and the size of the connection pool.
+
+Results are returned as `WeatherResult` objects instead of being printed.
+The API base URLs can be overridden, e.g. to point the client at a local
+stand-in server. Pass a `geocache.GeocodeCache` as `geocode_cache` to
+avoid repeating geocoding requests for cities seen before.
+
+Forecasts go through a `ForecastBatcher`: with `forecast_batch_size` > 1,
+the locations of several cities are fetched in one multi-coordinate
+request, and the same location is never requested twice at the same time.
+A `forecast_cache.ForecastCache` passed as `forecast_cache` serves recent
+forecasts without a request and refreshes stale ones in the background.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from forecast_batcher import Coordinates, ForecastBatcher
+
+GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+CURRENT_FIELDS = "temperature_2m,relative_humidity_2m,wind_speed_10m"
+# Errors that fail one city's lookup: network errors, plus the ValueError /
+# KeyError of a malformed response (e.g. a batch with too few forecasts)
+LOOKUP_ERRORS = (requests.exceptions.RequestException, ValueError, KeyError)
+
+
+@dataclass
+class Location:
+    """A geocoded city."""
+    name: str
+    country: str
+    latitude: float
+    longitude: float
+
+    @property
+    def display_name(self) -> str:
+        return f"{self.name}, {self.country}"
+
+
+@dataclass
+class CurrentWeather:
+    """Current conditions at a location."""
+    temperature: float
+    humidity: float
+    wind_speed: float
+
+
+@dataclass
+class WeatherResult:
+    """Outcome of a weather lookup for one city.
+
+    `location` is None if the city was not found; `error` holds the message
+    of a network error or a malformed response.
+    """
+    city: str
+    location: Optional[Location] = None
+    weather: Optional[CurrentWeather] = None
+    error: Optional[str] = None
+
+
+class WeatherClient:
+    """Fetches weather data over a pooled HTTP session."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        geocoding_url: str = GEOCODING_URL,
+        forecast_url: str = FORECAST_URL,
+        timeout: float = 10.0,
+        geocode_cache=None,
+        forecast_batch_size: int = 1,
+        forecast_batch_wait: float = 0.05,
+        forecast_cache=None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.geocoding_url = geocoding_url
+        self.forecast_url = forecast_url
+        self.timeout = timeout
+        self.geocode_cache = geocode_cache
+        self.forecast_cache = forecast_cache
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.forecasts = ForecastBatcher(
+            self._fetch_forecasts,
+            max_batch_size=forecast_batch_size,
+            max_wait=forecast_batch_wait,
+            max_concurrent_batches=max_concurrency,
+        )
+
+    def _get_json(self, url: str, params: dict) -> dict:
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def geocode(self, city_name: str) -> Optional[Location]:
+        """Look up the coordinates of a city; None if it is unknown."""
+        if self.geocode_cache is not None:
+            found, location = self.geocode_cache.lookup(city_name)
+            if found:
+                return location
+
+        location = self._fetch_location(city_name)
+        if self.geocode_cache is not None:
+            self.geocode_cache.store(city_name, location)
+        return location
+
+    def _fetch_location(self, city_name: str) -> Optional[Location]:
+        geo_data = self._get_json(self.geocoding_url, {
+            "name": city_name, "count": 1, "language": "en", "format": "json",
+        })
+        if not geo_data.get("results"):
+            return None
+        location = geo_data["results"][0]
+        return Location(
+            name=location["name"],
+            country=location.get("country", "N/A"),
+            latitude=location["latitude"],
+            longitude=location["longitude"],
+        )
+
+    def current_weather(self, location: Location) -> CurrentWeather:
+        """Fetch the current conditions at a location."""
+        return self._forecast(location).result()
+
+    def _forecast(self, location: Location) -> Future:
+        """Start a forecast lookup, through the cache if there is one."""
+        def fetch() -> Future:
+            return self.forecasts.submit(location.latitude, location.longitude)
+
+        if self.forecast_cache is None:
+            return fetch()
+        return self.forecast_cache.get(location.latitude, location.longitude, CURRENT_FIELDS, fetch)
+
+    def _fetch_forecasts(self, coordinates: List[Coordinates]) -> List[CurrentWeather]:
+        """Fetch current conditions for several locations in one request."""
+        weather_data = self._get_json(self.forecast_url, {
+            "latitude": ",".join(str(lat) for lat, _ in coordinates),
+            "longitude": ",".join(str(lon) for _, lon in coordinates),
+            "current": CURRENT_FIELDS,
+            "timezone": "auto",
+        })
+        # A single location is answered with an object, several with a list
+        if isinstance(weather_data, dict):
+            weather_data = [weather_data]
+        return [
+            CurrentWeather(
+                temperature=item["current"]["temperature_2m"],
+                humidity=item["current"]["relative_humidity_2m"],
+                wind_speed=item["current"]["wind_speed_10m"],
+            )
+            for item in weather_data
+        ]
+
+    def _locate(self, city_name: str) -> WeatherResult:
+        """Geocode a city into a WeatherResult without weather yet."""
+        result = WeatherResult(city=city_name)
+        try:
+            result.location = self.geocode(city_name)
+        except LOOKUP_ERRORS as error:
+            result.error = str(error)
+        return result
+
+    def get_weather(self, city_name: str) -> WeatherResult:
+        """Geocode a city and fetch its current weather."""
+        result = self._locate(city_name)
+        if result.location is not None:
+            try:
+                result.weather = self.current_weather(result.location)
+            except LOOKUP_ERRORS as error:
+                result.error = str(error)
+        return result
+
+    def get_weather_for_cities(self, city_names: Iterable[str]) -> List[WeatherResult]:
+        """Fetch the weather of many cities concurrently, in input order.
+
+        All cities are geocoded first; then every forecast is submitted at
+        once, so the batcher can fill complete batches.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            results = list(executor.map(self._locate, city_names))
+
+        pending = [
+            (result, self._forecast(result.location))
+            for result in results if result.location is not None
+        ]
+        self.forecasts.flush()
+        for result, future in pending:
+            try:
+                result.weather = future.result()
+            except LOOKUP_ERRORS as error:
+                result.error = str(error)
+        return results
+
+    def close(self) -> None:
+        self.forecasts.close()
+        self.session.close()
+
+    def __enter__(self) -> "WeatherClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def get_weather_for_cities(city_names: Iterable[str], max_concurrency: int = 10,
+                           **client_options) -> List[WeatherResult]:
+    """Fetch the weather of many cities with a short-lived `WeatherClient`."""
+    with WeatherClient(max_concurrency=max_concurrency, **client_options) as client:
+        return client.get_weather_for_cities(city_names)